@@ -1,9 +1,12 @@
 """Python SDK for Cursor's public APIs.
 
-This package provides a synchronous client for interacting with the Cursor API,
-along with custom exception types for robust error handling and retry utilities.
+This package provides synchronous and asynchronous clients for interacting with
+the Cursor API, along with custom exception types for robust error handling, retry utilities,
+and an optional in-process response cache.
 """
 
+from cursor_sdk.async_client import AsyncCursorClient
+from cursor_sdk.cache import ResponseCache
 from cursor_sdk.client import CursorClient
 from cursor_sdk.errors import (
     CursorAPIError,
@@ -12,14 +15,18 @@ from cursor_sdk.errors import (
     CursorNetworkError,
     CursorRateLimitError,
 )
-from cursor_sdk.retry import retry_with_backoff
+from cursor_sdk.retry import RetryEvent, TokenBucket, retry_with_backoff
 
 __all__ = [
     "CursorClient",
+    "AsyncCursorClient",
+    "ResponseCache",
     "CursorError",
     "CursorAPIError",
     "CursorAuthError",
     "CursorRateLimitError",
     "CursorNetworkError",
     "retry_with_backoff",
+    "TokenBucket",
+    "RetryEvent",
 ]
@@ -0,0 +1,333 @@
+"""Asynchronous HTTP client for Cursor's public APIs.
+
+This module provides the AsyncCursorClient class, an asyncio counterpart to
+CursorClient built on httpx.AsyncClient. It exposes the same endpoint methods
+as coroutines, so independent calls can run concurrently with asyncio.gather.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Mapping, Optional, TypeVar, Union
+from types import TracebackType
+
+import httpx
+
+from cursor_sdk.client import DEFAULT_TIMEOUT, AuthType, JSONLoader, _BaseCursorClient
+
+T = TypeVar("T")
+
+__all__ = ["AsyncCursorClient"]
+
+
+class AsyncCursorClient(_BaseCursorClient):
+    """Asynchronous client for the public Cursor APIs.
+
+    Endpoint methods mirror CursorClient one-to-one but must be awaited. Authentication,
+    HTTPS enforcement, path parameter sanitization, and error types are identical.
+    The response cache is only available on the synchronous client.
+
+    Example:
+        ```python
+        async with AsyncCursorClient("YOUR_API_KEY") as client:
+            me, models = await client.gather(
+                lambda c: c.get_v0_me(),
+                lambda c: c.get_v0_models(),
+            )
+        ```
+    """
+
+    _client: httpx.AsyncClient
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        base_url: str = "https://api.cursor.com",
+        auth: AuthType = "basic",
+        timeout: float = DEFAULT_TIMEOUT,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        default_headers: Optional[Mapping[str, str]] = None,
+        validate_api_key: bool = False,
+        allow_http: bool = False,
+        json_loader: Optional[JSONLoader] = None,
+    ) -> None:
+        super().__init__(
+            api_key,
+            base_url=base_url,
+            auth=auth,
+            default_headers=default_headers,
+            validate_api_key=validate_api_key,
+            allow_http=allow_http,
+            json_loader=json_loader,
+        )
+        self._client = httpx.AsyncClient(base_url=base_url, timeout=timeout, transport=transport)
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncCursorClient":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+    async def gather(self, *calls: Callable[["AsyncCursorClient"], Awaitable[T]]) -> list[T]:
+        """Run several endpoint calls concurrently over this client's connection pool.
+
+        Args:
+            *calls: Callables that take the client and return an awaitable,
+                e.g. ``lambda c: c.get_v0_me()``
+
+        Returns:
+            The results in the same order as ``calls``
+
+        Raises:
+            Exception: The first exception raised by a call
+        """
+        return list(await asyncio.gather(*(call(self) for call in calls)))
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,  # Any is necessary here as JSON can be dict, list, or primitive types
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Union[dict, list, str, None]:
+        request_headers = self._build_headers(headers)
+        try:
+            resp = await self._client.request(
+                method,
+                path,
+                params=params,
+                json=json,
+                headers=request_headers,
+                timeout=timeout,
+            )
+        except httpx.HTTPError as e:
+            raise self._network_error(e, method, path, request_headers) from e
+
+        return self._handle_response(resp, method, path)
+
+    async def delete_settings_repo_blocklists_repos_repo_id(self, repo_id: str, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """DELETE /settings/repo-blocklists/repos/:repoId"""
+        repo_id = self._sanitize_path_param(repo_id, "repo_id")
+        return await self._request('DELETE', f'/settings/repo-blocklists/repos/{repo_id}', params=params, headers=headers, timeout=timeout)
+
+    async def delete_teams_groups_group_id(self, group_id: str, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """DELETE /teams/groups/:groupId"""
+        group_id = self._sanitize_path_param(group_id, "group_id")
+        return await self._request('DELETE', f'/teams/groups/{group_id}', params=params, headers=headers, timeout=timeout)
+
+    async def delete_teams_groups_group_id_members(self, group_id: str, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """DELETE /teams/groups/:groupId/members"""
+        group_id = self._sanitize_path_param(group_id, "group_id")
+        return await self._request('DELETE', f'/teams/groups/{group_id}/members', params=params, headers=headers, timeout=timeout)
+
+    async def delete_v0_agents_id(self, id: str, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """DELETE /v0/agents/{id}"""
+        id = self._sanitize_path_param(id, "id")
+        return await self._request('DELETE', f'/v0/agents/{id}', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_ai_code_changes(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/ai-code/changes"""
+        return await self._request('GET', '/analytics/ai-code/changes', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_ai_code_changes_csv(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/ai-code/changes.csv"""
+        return await self._request('GET', '/analytics/ai-code/changes.csv', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_ai_code_commits(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/ai-code/commits"""
+        return await self._request('GET', '/analytics/ai-code/commits', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_ai_code_commits_csv(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/ai-code/commits.csv"""
+        return await self._request('GET', '/analytics/ai-code/commits.csv', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_by_user_agent_edits(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/by-user/agent-edits"""
+        return await self._request('GET', '/analytics/by-user/agent-edits', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_by_user_ask_mode(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/by-user/ask-mode"""
+        return await self._request('GET', '/analytics/by-user/ask-mode', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_by_user_client_versions(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/by-user/client-versions"""
+        return await self._request('GET', '/analytics/by-user/client-versions', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_by_user_commands(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/by-user/commands"""
+        return await self._request('GET', '/analytics/by-user/commands', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_by_user_mcp(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/by-user/mcp"""
+        return await self._request('GET', '/analytics/by-user/mcp', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_by_user_models(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/by-user/models"""
+        return await self._request('GET', '/analytics/by-user/models', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_by_user_plans(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/by-user/plans"""
+        return await self._request('GET', '/analytics/by-user/plans', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_by_user_tabs(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/by-user/tabs"""
+        return await self._request('GET', '/analytics/by-user/tabs', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_by_user_top_file_extensions(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/by-user/top-file-extensions"""
+        return await self._request('GET', '/analytics/by-user/top-file-extensions', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_team_agent_edits(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/team/agent-edits"""
+        return await self._request('GET', '/analytics/team/agent-edits', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_team_ask_mode(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/team/ask-mode"""
+        return await self._request('GET', '/analytics/team/ask-mode', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_team_client_versions(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/team/client-versions"""
+        return await self._request('GET', '/analytics/team/client-versions', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_team_commands(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/team/commands"""
+        return await self._request('GET', '/analytics/team/commands', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_team_dau(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/team/dau"""
+        return await self._request('GET', '/analytics/team/dau', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_team_leaderboard(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/team/leaderboard"""
+        return await self._request('GET', '/analytics/team/leaderboard', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_team_mcp(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/team/mcp"""
+        return await self._request('GET', '/analytics/team/mcp', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_team_models(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/team/models"""
+        return await self._request('GET', '/analytics/team/models', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_team_plans(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/team/plans"""
+        return await self._request('GET', '/analytics/team/plans', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_team_tabs(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/team/tabs"""
+        return await self._request('GET', '/analytics/team/tabs', params=params, headers=headers, timeout=timeout)
+
+    async def get_analytics_team_top_file_extensions(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /analytics/team/top-file-extensions"""
+        return await self._request('GET', '/analytics/team/top-file-extensions', params=params, headers=headers, timeout=timeout)
+
+    async def get_settings_repo_blocklists_repos(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /settings/repo-blocklists/repos"""
+        return await self._request('GET', '/settings/repo-blocklists/repos', params=params, headers=headers, timeout=timeout)
+
+    async def get_teams_audit_logs(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /teams/audit-logs"""
+        return await self._request('GET', '/teams/audit-logs', params=params, headers=headers, timeout=timeout)
+
+    async def get_teams_groups(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /teams/groups"""
+        return await self._request('GET', '/teams/groups', params=params, headers=headers, timeout=timeout)
+
+    async def get_teams_groups_group_id(self, group_id: str, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /teams/groups/:groupId"""
+        group_id = self._sanitize_path_param(group_id, "group_id")
+        return await self._request('GET', f'/teams/groups/{group_id}', params=params, headers=headers, timeout=timeout)
+
+    async def get_teams_members(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /teams/members"""
+        return await self._request('GET', '/teams/members', params=params, headers=headers, timeout=timeout)
+
+    async def get_v0_agents(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /v0/agents"""
+        return await self._request('GET', '/v0/agents', params=params, headers=headers, timeout=timeout)
+
+    async def get_v0_agents_id(self, id: str, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /v0/agents/{id}"""
+        id = self._sanitize_path_param(id, "id")
+        return await self._request('GET', f'/v0/agents/{id}', params=params, headers=headers, timeout=timeout)
+
+    async def get_v0_agents_id_conversation(self, id: str, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /v0/agents/{id}/conversation"""
+        id = self._sanitize_path_param(id, "id")
+        return await self._request('GET', f'/v0/agents/{id}/conversation', params=params, headers=headers, timeout=timeout)
+
+    async def get_v0_me(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /v0/me"""
+        return await self._request('GET', '/v0/me', params=params, headers=headers, timeout=timeout)
+
+    async def get_v0_models(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /v0/models"""
+        return await self._request('GET', '/v0/models', params=params, headers=headers, timeout=timeout)
+
+    async def get_v0_repositories(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """GET /v0/repositories"""
+        return await self._request('GET', '/v0/repositories', params=params, headers=headers, timeout=timeout)
+
+    async def patch_teams_groups_group_id(self, group_id: str, *, params: Optional[Mapping[str, Any]] = None, json: Any = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """PATCH /teams/groups/:groupId"""
+        group_id = self._sanitize_path_param(group_id, "group_id")
+        return await self._request('PATCH', f'/teams/groups/{group_id}', params=params, json=json, headers=headers, timeout=timeout)
+
+    async def post_bugbot_repo_update(self, *, params: Optional[Mapping[str, Any]] = None, json: Any = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """POST /bugbot/repo/update"""
+        return await self._request('POST', '/bugbot/repo/update', params=params, json=json, headers=headers, timeout=timeout)
+
+    async def post_settings_repo_blocklists_repos_upsert(self, *, params: Optional[Mapping[str, Any]] = None, json: Any = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """POST /settings/repo-blocklists/repos/upsert"""
+        return await self._request('POST', '/settings/repo-blocklists/repos/upsert', params=params, json=json, headers=headers, timeout=timeout)
+
+    async def post_teams_daily_usage_data(self, *, params: Optional[Mapping[str, Any]] = None, json: Any = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """POST /teams/daily-usage-data"""
+        return await self._request('POST', '/teams/daily-usage-data', params=params, json=json, headers=headers, timeout=timeout)
+
+    async def post_teams_filtered_usage_events(self, *, params: Optional[Mapping[str, Any]] = None, json: Any = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """POST /teams/filtered-usage-events"""
+        return await self._request('POST', '/teams/filtered-usage-events', params=params, json=json, headers=headers, timeout=timeout)
+
+    async def post_teams_groups(self, *, params: Optional[Mapping[str, Any]] = None, json: Any = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """POST /teams/groups"""
+        return await self._request('POST', '/teams/groups', params=params, json=json, headers=headers, timeout=timeout)
+
+    async def post_teams_groups_group_id_members(self, group_id: str, *, params: Optional[Mapping[str, Any]] = None, json: Any = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """POST /teams/groups/:groupId/members"""
+        group_id = self._sanitize_path_param(group_id, "group_id")
+        return await self._request('POST', f'/teams/groups/{group_id}/members', params=params, json=json, headers=headers, timeout=timeout)
+
+    async def post_teams_spend(self, *, params: Optional[Mapping[str, Any]] = None, json: Any = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """POST /teams/spend"""
+        return await self._request('POST', '/teams/spend', params=params, json=json, headers=headers, timeout=timeout)
+
+    async def post_teams_user_spend_limit(self, *, params: Optional[Mapping[str, Any]] = None, json: Any = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """POST /teams/user-spend-limit"""
+        return await self._request('POST', '/teams/user-spend-limit', params=params, json=json, headers=headers, timeout=timeout)
+
+    async def post_v0_agents(self, *, params: Optional[Mapping[str, Any]] = None, json: Any = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """POST /v0/agents"""
+        return await self._request('POST', '/v0/agents', params=params, json=json, headers=headers, timeout=timeout)
+
+    async def post_v0_agents_id_followup(self, id: str, *, params: Optional[Mapping[str, Any]] = None, json: Any = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """POST /v0/agents/{id}/followup"""
+        id = self._sanitize_path_param(id, "id")
+        return await self._request('POST', f'/v0/agents/{id}/followup', params=params, json=json, headers=headers, timeout=timeout)
+
+    async def post_v0_agents_id_stop(self, id: str, *, params: Optional[Mapping[str, Any]] = None, json: Any = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
+        """POST /v0/agents/{id}/stop"""
+        id = self._sanitize_path_param(id, "id")
+        return await self._request('POST', f'/v0/agents/{id}/stop', params=params, json=json, headers=headers, timeout=timeout)
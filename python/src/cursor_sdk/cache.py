@@ -0,0 +1,294 @@
+"""In-process response cache for idempotent GET requests.
+
+This module provides the ResponseCache class, an LRU store with per-entry
+time-to-live, stale-while-revalidate, and stale-if-error windows. Pass an
+instance to CursorClient to serve repeated GETs from memory instead of the
+network, to revalidate expired entries with conditional requests
+(ETag/Last-Modified), and to fall back to a stale body when the network fails.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Mapping, Optional, Union
+
+import httpx
+
+__all__ = ["ResponseCache", "CacheEntry", "CacheKey", "cache_key"]
+
+CacheKey = tuple[Hashable, ...]
+
+
+def cache_key(
+    method: str,
+    path: str,
+    params: Optional[Mapping[str, Any]],
+    headers: Mapping[str, str],
+) -> CacheKey:
+    """Build a cache key for a request.
+
+    Query parameters and headers are sorted so equivalent requests share a key.
+    The Authorization header is replaced by a digest, which keeps credentials out of
+    the cache while still separating responses for different API keys.
+    """
+    query = tuple(sorted(httpx.QueryParams(params or {}).multi_items()))
+    header_items = []
+    for name, value in headers.items():
+        name = name.lower()
+        if name == "authorization":
+            value = hashlib.sha256(value.encode("utf-8")).hexdigest()
+        header_items.append((name, value))
+    return (method.upper(), path, query, tuple(sorted(header_items)))
+
+
+def _parse_cache_control(value: str) -> dict[str, Optional[str]]:
+    """Parse a Cache-Control header into a mapping of lowercase directives to arguments."""
+    directives: dict[str, Optional[str]] = {}
+    for part in value.split(","):
+        name, sep, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip().strip('"') if sep else None
+    return directives
+
+
+def _directive_seconds(directives: Mapping[str, Optional[str]], name: str) -> Optional[float]:
+    """Return a non-negative delta-seconds directive argument, or None when absent or invalid."""
+    arg = directives.get(name)
+    if arg is None:
+        return None
+    try:
+        seconds = float(arg)
+    except ValueError:
+        return None
+    return seconds if seconds >= 0 else None
+
+
+@dataclass
+class CacheEntry:
+    """A cached response body and its freshness window.
+
+    Attributes:
+        body: Parsed response body, as returned by the client
+        fresh_until: Clock time until which the entry is served without revalidation
+        stale_until: Clock time until which the entry may be served while it is refreshed
+        error_until: Clock time until which the entry may be served when fetching a
+            replacement fails with a network error
+        etag: The response's ETag header, if any
+        last_modified: The response's Last-Modified header, if any
+    """
+
+    body: Union[dict, list, str, None]
+    fresh_until: float
+    stale_until: float
+    error_until: float = 0.0
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.fresh_until
+
+    @property
+    def has_validators(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of response bodies with TTL and stale-while-revalidate.
+
+    Freshness follows the response's ``Cache-Control`` header when present:
+    ``max-age``, ``stale-while-revalidate``, and ``stale-if-error`` override the
+    defaults below and ``no-store`` prevents caching. Expired entries that carry an
+    ``ETag`` or ``Last-Modified`` validator are kept (until evicted) so the client
+    can revalidate them with a conditional request instead of downloading the body
+    again. Responses with neither freshness information nor validators are only
+    stored when a non-zero ``ttl`` opts in to caching them. Cached bodies are
+    returned as-is, so callers should treat them as read-only.
+
+    Args:
+        maxsize: Maximum number of entries kept (default: 128)
+        ttl: Default time in seconds a response without ``max-age`` stays fresh (default: 0.0)
+        stale_while_revalidate: Default time in seconds a stale response may still be
+            served while the client refreshes it in the background (default: 0.0)
+        stale_if_error: Default time in seconds past freshness during which a stale
+            response is served if fetching a new one fails with a network error (default: 0.0)
+        clock: Monotonic time source (default: time.monotonic)
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        *,
+        ttl: float = 0.0,
+        stale_while_revalidate: float = 0.0,
+        stale_if_error: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if ttl < 0 or stale_while_revalidate < 0 or stale_if_error < 0:
+            raise ValueError("ttl, stale_while_revalidate, and stale_if_error must be non-negative")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def now(self) -> float:
+        """Return the current time on the cache's clock."""
+        return self._clock()
+
+    def get(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Return the entry for ``key`` if it is fresh or still within its stale window."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now >= entry.stale_until:
+                if not entry.has_validators and now >= entry.error_until:
+                    del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: CacheKey, body: Union[dict, list, str, None], headers: Optional[Mapping[str, str]] = None) -> None:
+        """Store ``body`` under ``key``, honoring the response's Cache-Control header."""
+        headers = headers or {}
+        freshness = self._freshness(headers)
+        if freshness is None:
+            self.delete(key)
+            return
+
+        fresh_until, stale_until, error_until = freshness
+        has_validators = headers.get("etag") is not None or headers.get("last-modified") is not None
+        if not has_validators and max(stale_until, error_until) <= self._clock():
+            # Already expired with nothing to revalidate against, so it could never be served
+            self.delete(key)
+            return
+
+        entry = CacheEntry(
+            body=body,
+            fresh_until=fresh_until,
+            stale_until=stale_until,
+            error_until=error_until,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def conditional_headers(self, key: CacheKey) -> dict[str, str]:
+        """Return If-None-Match / If-Modified-Since headers for revalidating ``key``.
+
+        The mapping is empty when nothing is cached for ``key`` or the entry has no validators.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        headers: dict[str, str] = {}
+        if entry is not None:
+            if entry.etag is not None:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified is not None:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def revalidate(self, key: CacheKey, headers: Optional[Mapping[str, str]] = None) -> Optional[CacheEntry]:
+        """Renew the entry for ``key`` after a ``304 Not Modified`` response.
+
+        Freshness is recomputed from the 304's headers and any updated validators are
+        stored. Returns the renewed entry, or None if it is no longer cached.
+        """
+        headers = headers or {}
+        freshness = self._freshness(headers)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if freshness is None:
+                del self._entries[key]
+                return entry
+            entry.fresh_until, entry.stale_until, entry.error_until = freshness
+            entry.etag = headers.get("etag", entry.etag)
+            entry.last_modified = headers.get("last-modified", entry.last_modified)
+            self._entries.move_to_end(key)
+            return entry
+
+    def get_stale_if_error(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Return the entry for ``key`` if it may be served in place of a failed fetch.
+
+        Lookups through this method do not count towards ``hits`` or ``misses``.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now >= entry.error_until:
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _freshness(self, headers: Mapping[str, str]) -> Optional[tuple[float, float, float]]:
+        """Return ``(fresh_until, stale_until, error_until)`` for a response, or None if it must not be stored."""
+        directives = _parse_cache_control(headers.get("cache-control", ""))
+        if "no-store" in directives:
+            return None
+
+        max_age = _directive_seconds(directives, "max-age")
+        ttl = self.ttl if max_age is None else max_age
+        if "no-cache" in directives:
+            # Stored, but must be refreshed before it is served as fresh
+            ttl = 0.0
+        swr = _directive_seconds(directives, "stale-while-revalidate")
+        if swr is None:
+            swr = self.stale_while_revalidate
+        sie = _directive_seconds(directives, "stale-if-error")
+        if sie is None:
+            sie = self.stale_if_error
+
+        now = self._clock()
+        return now + ttl, now + ttl + swr, now + ttl + sie
+
+    def delete(self, key: CacheKey) -> None:
+        """Remove the entry for ``key`` if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self, path: str, *, descendants: bool = True) -> None:
+        """Remove every entry cached for ``path``, whatever its params or headers.
+
+        Args:
+            path: API path whose cached responses are stale, e.g. after a write to it
+            descendants: Also remove entries for paths nested under ``path``
+        """
+        prefix = path.rstrip("/") + "/"
+        with self._lock:
+            stale = [
+                key
+                for key in self._entries
+                if len(key) > 1 and (key[1] == path or (descendants and str(key[1]).startswith(prefix)))
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all entries and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
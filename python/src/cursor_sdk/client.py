@@ -8,22 +8,35 @@ as a method on the client instance.
 from __future__ import annotations
 
 import base64
+import logging
 import re
-from typing import Any, Literal, Mapping, MutableMapping, NamedTuple, Optional, Union
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from json import loads as _default_json_loader
+from typing import Any, Callable, Iterator, Literal, Mapping, MutableMapping, NamedTuple, Optional, TypeVar, Union
 from types import TracebackType
 from urllib.parse import urlparse
 
 import httpx
 
+from cursor_sdk.cache import CacheKey, ResponseCache, cache_key
 from cursor_sdk.errors import (
     CursorAPIError,
     CursorAuthError,
+    CursorError,
     CursorNetworkError,
     CursorRateLimitError,
 )
 
 AuthType = Literal["basic", "bearer"]
 
+# Decodes a raw JSON response body; must raise ValueError or TypeError on invalid input
+JSONLoader = Callable[[bytes], Any]
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
 # HTTP status code constants
 HTTP_STATUS_NOT_MODIFIED = 304
 HTTP_STATUS_UNAUTHORIZED = 401
@@ -111,35 +124,30 @@ ENDPOINT_SPECS: tuple[EndpointSpec, ...] = (
     EndpointSpec('POST', '/v0/agents/{id}/stop', 'post_v0_agents_id_stop'),
 )
 
-__all__ = ["CursorClient", "AuthType", "ENDPOINT_SPECS"]
-
-
-class CursorClient:
-    """Synchronous client for the public Cursor APIs.
+__all__ = ["CursorClient", "AuthType", "JSONLoader", "ENDPOINT_SPECS"]
 
-    This client provides methods for all documented Cursor API endpoints. Method names
-    are derived directly from the HTTP method and path (e.g., GET /teams/members becomes
-    get_teams_members). While these names can be long, this design ensures a 1:1 mapping
-    with the API documentation and prevents naming conflicts.
 
-    The SDK supports endpoints from multiple API versions:
-    - `/v0/*` endpoints are part of the v0 API
-    - Non-prefixed endpoints (e.g., `/teams/*`, `/analytics/*`) are versioned independently
+class _BaseCursorClient:
+    """Transport-independent logic shared by the sync and async clients.
 
-    See the main README.md for usage examples and authentication details.
+    Covers argument validation, authentication headers, path parameter
+    sanitization, and turning HTTP responses into results or typed errors.
+    JSON bodies are decoded with ``json_loader``, which defaults to ``json.loads``
+    (the same decoding as ``httpx.Response.json()``).
     """
 
+    _client: Union[httpx.Client, httpx.AsyncClient]
+
     def __init__(
         self,
         api_key: str,
         *,
-        base_url: str = "https://api.cursor.com",
-        auth: AuthType = "basic",
-        timeout: float = DEFAULT_TIMEOUT,
-        transport: Optional[httpx.BaseTransport] = None,
-        default_headers: Optional[Mapping[str, str]] = None,
-        validate_api_key: bool = False,
-        allow_http: bool = False,
+        base_url: str,
+        auth: AuthType,
+        default_headers: Optional[Mapping[str, str]],
+        validate_api_key: bool,
+        allow_http: bool,
+        json_loader: Optional[JSONLoader],
     ) -> None:
         if not api_key:
             raise ValueError("api_key is required")
@@ -164,35 +172,21 @@ class CursorClient:
             warnings.warn(
                 "Using HTTP is insecure and may expose your API key. Use HTTPS in production.",
                 UserWarning,
-                stacklevel=2,
+                stacklevel=3,
             )
 
         self._api_key = api_key
         self._auth = auth
         self._default_headers = dict(default_headers or {})
-        self._client = httpx.Client(base_url=base_url, timeout=timeout, transport=transport)
+        self._json_loader: JSONLoader = json_loader or _default_json_loader
 
     def __repr__(self) -> str:
         """Return a safe representation that doesn't expose the API key."""
-        return f"<CursorClient(base_url='{self._client.base_url}', auth='{self._auth}')>"
+        return f"<{type(self).__name__}(base_url='{self._client.base_url}', auth='{self._auth}')>"
 
     def __str__(self) -> str:
         """Return a safe string representation that doesn't expose the API key."""
-        return f"CursorClient(base_url='{self._client.base_url}', auth='{self._auth}')"
-
-    def close(self) -> None:
-        self._client.close()
-
-    def __enter__(self) -> "CursorClient":
-        return self
-
-    def __exit__(
-        self,
-        exc_type: Optional[type[BaseException]],
-        exc: Optional[BaseException],
-        tb: Optional[TracebackType],
-    ) -> None:
-        self.close()
+        return f"{type(self).__name__}(base_url='{self._client.base_url}', auth='{self._auth}')"
 
     def _auth_header_value(self) -> str:
         """Generate the Authorization header value.
@@ -216,6 +210,18 @@ class CursorClient:
         headers["Authorization"] = self._auth_header_value()
         return headers
 
+    def _network_error(
+        self, error: httpx.HTTPError, method: str, path: str, headers: Mapping[str, str]
+    ) -> CursorNetworkError:
+        """Wrap a transport error, recording the request's Idempotency-Key for retry logic."""
+        return CursorNetworkError(
+            f"Request failed due to a network error: {method} {path}",
+            method=method,
+            url=path,
+            cause=error,
+            idempotency_key=httpx.Headers(headers).get("Idempotency-Key"),
+        )
+
     def _sanitize_path_param(self, param: str, param_name: str) -> str:
         """Sanitize path parameters to prevent path traversal and injection attacks.
 
@@ -250,29 +256,7 @@ class CursorClient:
         from urllib.parse import quote
         return quote(param, safe="")
 
-    def _request(
-        self,
-        method: str,
-        path: str,
-        *,
-        params: Optional[Mapping[str, Any]] = None,
-        json: Any = None,  # Any is necessary here as JSON can be dict, list, or primitive types
-        headers: Optional[Mapping[str, str]] = None,
-        timeout: Optional[float] = None,
-    ) -> Union[dict, list, str, None]:
-        try:
-            resp = self._client.request(
-                method,
-                path,
-                params=params,
-                json=json,
-                headers=self._build_headers(headers),
-                timeout=timeout,
-            )
-        except httpx.HTTPError as e:
-            error_msg = f"Request failed due to a network error: {method} {path}"
-            raise CursorNetworkError(error_msg, method=method, url=path, cause=e) from e
-
+    def _handle_response(self, resp: httpx.Response, method: str, path: str) -> Union[dict, list, str, None]:
         if resp.status_code == HTTP_STATUS_NOT_MODIFIED:
             return None
 
@@ -286,7 +270,7 @@ class CursorClient:
 
             if "application/json" in content_type or content_type.endswith("+json"):
                 try:
-                    return resp.json()
+                    return self._json_loader(resp.content)
                 except (ValueError, TypeError):
                     # If JSON parsing fails despite content-type, fallback to text
                     return resp.text
@@ -294,7 +278,7 @@ class CursorClient:
             # Fallback: try to parse as JSON, otherwise return as text
             # This handles cases where content-type is missing or unexpected
             try:
-                return resp.json()
+                return self._json_loader(resp.content)
             except (ValueError, TypeError):
                 # ValueError for invalid JSON, TypeError for non-string content
                 return resp.text
@@ -304,7 +288,7 @@ class CursorClient:
         body: Any = None
         message = resp.reason_phrase or "Request failed."
         try:
-            body = resp.json()
+            body = self._json_loader(resp.content)
             if isinstance(body, dict):
                 # Try "message" first, then "error", fallback to reason phrase
                 message = str(body.get("message") or body.get("error") or message)
@@ -329,6 +313,378 @@ class CursorClient:
             url=path,
         )
 
+
+class CursorClient(_BaseCursorClient):
+    """Synchronous client for the public Cursor APIs.
+
+    This client provides methods for all documented Cursor API endpoints. Method names
+    are derived directly from the HTTP method and path (e.g., GET /teams/members becomes
+    get_teams_members). While these names can be long, this design ensures a 1:1 mapping
+    with the API documentation and prevents naming conflicts.
+
+    The SDK supports endpoints from multiple API versions:
+    - `/v0/*` endpoints are part of the v0 API
+    - Non-prefixed endpoints (e.g., `/teams/*`, `/analytics/*`) are versioned independently
+
+    With ``coalesce_requests=True``, concurrent identical GET requests (same path, query
+    parameters, and headers) from different threads share a single network call.
+
+    See the main README.md for usage examples and authentication details.
+    """
+
+    _client: httpx.Client
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        base_url: str = "https://api.cursor.com",
+        auth: AuthType = "basic",
+        timeout: float = DEFAULT_TIMEOUT,
+        transport: Optional[httpx.BaseTransport] = None,
+        default_headers: Optional[Mapping[str, str]] = None,
+        validate_api_key: bool = False,
+        allow_http: bool = False,
+        cache: Optional[ResponseCache] = None,
+        json_loader: Optional[JSONLoader] = None,
+        coalesce_requests: bool = False,
+    ) -> None:
+        super().__init__(
+            api_key,
+            base_url=base_url,
+            auth=auth,
+            default_headers=default_headers,
+            validate_api_key=validate_api_key,
+            allow_http=allow_http,
+            json_loader=json_loader,
+        )
+        self._client = httpx.Client(base_url=base_url, timeout=timeout, transport=transport)
+        self._cache = cache
+        # Background refreshes for stale-while-revalidate cache hits
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
+        self._refreshing: set[CacheKey] = set()
+        self._refresh_lock = threading.Lock()
+        # Single-flight GETs: concurrent identical requests share one in-flight call
+        self._coalesce_requests = coalesce_requests
+        self._inflight: dict[CacheKey, Future[Union[dict, list, str, None]]] = {}
+        self._inflight_lock = threading.Lock()
+
+    def close(self) -> None:
+        if self._refresh_executor is not None:
+            # Let in-flight cache refreshes finish before the connection pool goes away
+            self._refresh_executor.shutdown(wait=True)
+            self._refresh_executor = None
+        self._client.close()
+
+    def __enter__(self) -> "CursorClient":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def gather(self, *calls: Callable[["CursorClient"], T], max_workers: int = 8) -> list[T]:
+        """Run several endpoint calls concurrently over this client's connection pool.
+
+        Args:
+            *calls: Callables that take the client, e.g. ``lambda c: c.get_v0_me()``
+            max_workers: Maximum number of calls in flight at once (default: 8)
+
+        Returns:
+            The results in the same order as ``calls``
+
+        Raises:
+            Exception: The first (in call order) exception raised by a call, once all calls have finished
+        """
+        if not calls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as executor:
+            futures = [executor.submit(call, self) for call in calls]
+        return [future.result() for future in futures]
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,  # Any is necessary here as JSON can be dict, list, or primitive types
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> Union[dict, list, str, None]:
+        request_headers = self._build_headers(headers)
+        if method == "GET":
+            if self._coalesce_requests:
+                return self._coalesced_get(path, params=params, headers=request_headers, timeout=timeout)
+            return self._get(path, params=params, headers=request_headers, timeout=timeout)
+
+        resp = self._send(method, path, params=params, json=json, headers=request_headers, timeout=timeout)
+        result = self._handle_response(resp, method, path)
+        if self._cache is not None:
+            # A successful write makes cached reads of the resource and its collection stale
+            self._cache.invalidate(path)
+            parent = path.rpartition("/")[0]
+            if parent:
+                self._cache.invalidate(parent, descendants=False)
+        return result
+
+    def _get(
+        self,
+        path: str,
+        *,
+        params: Optional[Mapping[str, Any]],
+        headers: Mapping[str, str],
+        timeout: Optional[float],
+    ) -> Union[dict, list, str, None]:
+        if self._cache is not None:
+            return self._cached_get(self._cache, path, params=params, headers=headers, timeout=timeout)
+        resp = self._send("GET", path, params=params, headers=headers, timeout=timeout)
+        return self._handle_response(resp, "GET", path)
+
+    def _coalesced_get(
+        self,
+        path: str,
+        *,
+        params: Optional[Mapping[str, Any]],
+        headers: Mapping[str, str],
+        timeout: Optional[float],
+    ) -> Union[dict, list, str, None]:
+        """Perform a GET, sharing the result with identical GETs already in flight.
+
+        The first caller for a key sends the request; callers arriving while it is in
+        flight wait for it and receive the same result object, or the same exception.
+        If the first caller is interrupted (e.g. by KeyboardInterrupt), that is not passed
+        on: the waiting callers send the request again themselves.
+        """
+        key = cache_key("GET", path, params, headers)
+        while True:
+            with self._inflight_lock:
+                future = self._inflight.get(key)
+                leader = future is None
+                if future is None:
+                    future = self._inflight[key] = Future()
+            if leader:
+                break
+            try:
+                return future.result()
+            except CancelledError:
+                if not future.cancelled():
+                    raise  # The leader's own request failed with CancelledError
+
+        try:
+            result = self._get(path, params=params, headers=headers, timeout=timeout)
+        except Exception as e:
+            with self._inflight_lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        except BaseException:
+            with self._inflight_lock:
+                del self._inflight[key]
+            # Cancelling releases the waiters without handing them the interruption
+            future.cancel()
+            raise
+        with self._inflight_lock:
+            del self._inflight[key]
+        future.set_result(result)
+        return result
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        *,
+        params: Optional[Mapping[str, Any]] = None,
+        json: Any = None,
+        headers: Mapping[str, str],
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        try:
+            return self._client.request(
+                method,
+                path,
+                params=params,
+                json=json,
+                headers=headers,
+                timeout=timeout,
+            )
+        except httpx.HTTPError as e:
+            raise self._network_error(e, method, path, headers) from e
+
+    def _cached_get(
+        self,
+        cache: ResponseCache,
+        path: str,
+        *,
+        params: Optional[Mapping[str, Any]],
+        headers: Mapping[str, str],
+        timeout: Optional[float],
+    ) -> Union[dict, list, str, None]:
+        """Serve a GET from the response cache, falling back to the network on a miss.
+
+        Stale entries inside their stale-while-revalidate window are returned immediately
+        and refreshed on a background thread. Expired entries with an ETag or Last-Modified
+        validator are revalidated with a conditional request; a 304 returns the cached body.
+        If the fetch fails with a network error, an entry still inside its stale-if-error
+        window is returned instead of raising.
+        """
+        key = cache_key("GET", path, params, headers)
+        entry = cache.get(key)
+        if entry is None:
+            try:
+                return self._fetch_into_cache(cache, key, path, params=params, headers=headers, timeout=timeout)
+            except CursorNetworkError as e:
+                stale = cache.get_stale_if_error(key)
+                if stale is None:
+                    raise
+                logger.warning("Serving stale cached response for GET %s after a network error: %s", path, e.__cause__)
+                return stale.body
+
+        if not entry.is_fresh(cache.now()):
+            self._refresh_in_background(cache, key, path, params=params, headers=headers, timeout=timeout)
+        return entry.body
+
+    def _fetch_into_cache(
+        self,
+        cache: ResponseCache,
+        key: CacheKey,
+        path: str,
+        *,
+        params: Optional[Mapping[str, Any]],
+        headers: Mapping[str, str],
+        timeout: Optional[float],
+    ) -> Union[dict, list, str, None]:
+        request_headers = headers
+        validators = cache.conditional_headers(key)
+        if validators:
+            # Revalidate instead of refetching; never replace validators the caller set
+            present = {name.lower() for name in headers}
+            request_headers = dict(headers)
+            request_headers.update((name, value) for name, value in validators.items() if name.lower() not in present)
+
+        resp = self._send("GET", path, params=params, headers=request_headers, timeout=timeout)
+        if resp.status_code == HTTP_STATUS_NOT_MODIFIED and validators:
+            entry = cache.revalidate(key, resp.headers)
+            if entry is not None:
+                return entry.body
+
+        body = self._handle_response(resp, "GET", path)
+        if 200 <= resp.status_code < 300:
+            cache.set(key, body, resp.headers)
+        return body
+
+    def _refresh_in_background(
+        self,
+        cache: ResponseCache,
+        key: CacheKey,
+        path: str,
+        *,
+        params: Optional[Mapping[str, Any]],
+        headers: Mapping[str, str],
+        timeout: Optional[float],
+    ) -> None:
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(thread_name_prefix="cursor-sdk-refresh")
+            executor = self._refresh_executor
+
+        def refresh() -> None:
+            try:
+                self._fetch_into_cache(cache, key, path, params=params, headers=headers, timeout=timeout)
+            except CursorError:
+                # The stale entry stays in place; the next access past its window refetches
+                pass
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        executor.submit(refresh)
+
+    def stream_v0_agents(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Iterator[Any]:
+        """GET /v0/agents, yielding each agent as it is parsed.
+
+        Unlike get_v0_agents, the response body is never held in memory as a whole.
+        Requires the optional ``ijson`` dependency (``pip install "cursor-endpoint-sdk[stream]"``).
+        Only the requested page is streamed; pass ``params={"cursor": ...}`` for the next one.
+        """
+        return self._stream_items('/v0/agents', 'agents.item', params=params, headers=headers, timeout=timeout)
+
+    def stream_v0_repositories(self, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Iterator[Any]:
+        """GET /v0/repositories, yielding each repository as it is parsed.
+
+        Unlike get_v0_repositories, the response body is never held in memory as a whole.
+        Requires the optional ``ijson`` dependency (``pip install "cursor-endpoint-sdk[stream]"``).
+        """
+        return self._stream_items('/v0/repositories', 'repositories.item', params=params, headers=headers, timeout=timeout)
+
+    def _stream_items(
+        self,
+        path: str,
+        prefix: str,
+        *,
+        params: Optional[Mapping[str, Any]],
+        headers: Optional[Mapping[str, str]],
+        timeout: Optional[float],
+    ) -> Iterator[Any]:
+        """Stream a GET response and yield the JSON values found at ``prefix``.
+
+        The request is sent when iteration starts and the connection is released when the
+        iterator is exhausted or closed. Streaming bypasses the response cache.
+
+        Raises:
+            ImportError: If ijson is not installed
+            CursorAPIError: If the API returns a non-2xx response or the body is not valid JSON
+            CursorNetworkError: If the request or the body download fails
+        """
+        try:
+            import ijson
+        except ImportError as e:
+            raise ImportError(
+                'Streaming responses requires ijson. Install it with: pip install "cursor-endpoint-sdk[stream]"'
+            ) from e
+
+        request_headers = self._build_headers(headers)
+        try:
+            with self._client.stream("GET", path, params=params, headers=request_headers, timeout=timeout) as resp:
+                if not 200 <= resp.status_code < 300:
+                    resp.read()
+                    # Raises for everything but 304 Not Modified, which has no items to yield
+                    self._handle_response(resp, "GET", path)
+                    return
+
+                # Push chunks into ijson as they arrive and hand out each completed item
+                items: list[Any] = ijson.sendable_list()
+                parser = ijson.items_coro(items, prefix)
+                received = False
+                try:
+                    for chunk in resp.iter_bytes():  # never yields empty chunks
+                        received = True
+                        parser.send(chunk)
+                        yield from items
+                        del items[:]
+                    if not received:
+                        # An empty body (e.g. 204 No Content) has no items, as get_* returns None
+                        return
+                    parser.close()
+                except ijson.JSONError as e:
+                    raise CursorAPIError(
+                        resp.status_code,
+                        f"Response body is not valid JSON: {e}",
+                        headers=dict(resp.headers),
+                        method="GET",
+                        url=path,
+                    ) from e
+                yield from items
+        except httpx.HTTPError as e:
+            raise self._network_error(e, "GET", path, request_headers) from e
+
     def delete_settings_repo_blocklists_repos_repo_id(self, repo_id: str, *, params: Optional[Mapping[str, Any]] = None, headers: Optional[Mapping[str, str]] = None, timeout: Optional[float] = None) -> Union[dict, list, str, None]:
         """DELETE /settings/repo-blocklists/repos/:repoId"""
         repo_id = self._sanitize_path_param(repo_id, "repo_id")
@@ -7,7 +7,7 @@ network issues.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import FrozenInstanceError, dataclass, fields
 from typing import Any, Mapping, Optional
 from types import TracebackType
 
@@ -25,7 +25,7 @@ class CursorError(Exception):
     """Base exception for the Cursor SDK."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CursorAPIError(CursorError):
     status_code: int
     message: str
@@ -41,17 +41,59 @@ class CursorAPIError(CursorError):
             context = f" ({self.method} {self.url})"
         return f"Cursor API error {self.status_code}: {self.message}{context}"
 
+    def __reduce__(self) -> tuple[Any, ...]:
+        # BaseException pickles and copies from self.args, which the dataclass leaves
+        # empty, so rebuild from the field values and restore any extra exception state.
+        values = tuple(getattr(self, f.name) for f in fields(self))
+        return _rebuild_api_error, (type(self), values, self.__dict__)
+
+
+_API_ERROR_FIELDS = frozenset(f.name for f in fields(CursorAPIError))
+
+
+# The dataclass-generated frozen __setattr__/__delattr__ reject every name (and, with
+# slots=True, fail with a TypeError), which breaks the __traceback__ updates
+# contextlib makes while the error propagates. Only the dataclass fields are frozen.
+def _api_error_setattr(self: CursorAPIError, name: str, value: Any) -> None:
+    if name in _API_ERROR_FIELDS:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+    CursorError.__setattr__(self, name, value)
+
+
+def _api_error_delattr(self: CursorAPIError, name: str) -> None:
+    if name in _API_ERROR_FIELDS:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+    CursorError.__delattr__(self, name)
+
+
+CursorAPIError.__setattr__ = _api_error_setattr  # type: ignore[assignment]
+CursorAPIError.__delattr__ = _api_error_delattr  # type: ignore[assignment]
+
+
+def _rebuild_api_error(cls: type[CursorAPIError], values: tuple[Any, ...], state: dict[str, Any]) -> CursorAPIError:
+    error = cls(*values)
+    error.__dict__.update(state)
+    return error
+
 
 class CursorAuthError(CursorAPIError):
     """Raised on 401/403 responses."""
 
+    __slots__ = ()
+
 
 class CursorRateLimitError(CursorAPIError):
     """Raised on 429 responses."""
 
+    __slots__ = ()
+
 
 class CursorNetworkError(CursorError):
-    """Raised on network/transport errors."""
+    """Raised on network/transport errors.
+
+    ``idempotency_key`` holds the request's Idempotency-Key header, if it sent one,
+    so retry logic can tell whether a failed non-idempotent request is safe to resend.
+    """
 
     def __init__(
         self,
@@ -60,11 +102,13 @@ class CursorNetworkError(CursorError):
         cause: Exception,
         method: Optional[str] = None,
         url: Optional[str] = None,
+        idempotency_key: Optional[str] = None,
     ) -> None:
         super().__init__(message)
         self.__cause__ = cause
         self.method = method
         self.url = url
+        self.idempotency_key = idempotency_key
 
     def __str__(self) -> str:  # pragma: no cover
         context = ""
@@ -2,87 +2,543 @@
 
 from __future__ import annotations
 
+import asyncio
+import inspect
+import math
+import random
+import threading
 import time
-from functools import wraps
-from typing import Any, Callable, TypeVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache, wraps
+from typing import Any, Callable, Hashable, Iterable, Literal, TypeVar
 
 from cursor_sdk.errors import CursorNetworkError, CursorRateLimitError
 
 T = TypeVar("T")
 
+# How often a coroutine's backoff checks cancel_event; a threading.Event cannot wake the loop itself
+_CANCEL_POLL_INTERVAL = 0.05
+
+# Longest Retry-After honored in full; absurd values (e.g. a year-9999 date) would overflow sleep()
+_MAX_RETRY_AFTER = 24 * 60 * 60.0
+
+RetryReason = Literal["network", "rate_limit", "retry_after"]
+
+# HTTP methods that RFC 9110 defines as idempotent, which are safe to resend after a network error
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+
+def _jittered(delay: float, jitter: float, uniform: Callable[[float, float], float] = random.uniform) -> float:
+    """Spread ``delay`` over ``[delay * (1 - jitter), delay]`` so concurrent callers don't retry in lockstep."""
+    if not jitter:
+        return delay
+    return delay - uniform(0.0, delay * jitter)
+
+
+# Decorators are commonly built inline per call; identical settings share one schedule
+@lru_cache(maxsize=64)
+def _backoff_delays(max_retries: int, initial_delay: float, max_delay: float, exponential_base: float) -> tuple[float, ...]:
+    """Return the backoff delay before each retry, capped at ``max_delay``."""
+    delays: list[float] = []
+    for attempt in range(max_retries):
+        if exponential_base == 2.0:
+            # ldexp scales by a power of two exactly, without a generic pow() call
+            delay = math.ldexp(initial_delay, attempt)
+        else:
+            delay = initial_delay * (exponential_base ** attempt)
+        if delay >= max_delay and exponential_base >= 1.0:
+            # Every later delay is capped as well; stop before the exponent can overflow
+            delays.extend([max_delay] * (max_retries - attempt))
+            break
+        delays.append(min(delay, max_delay))
+    return tuple(delays)
+
+
+async def _wait_for_event(event: threading.Event, timeout: float) -> bool:
+    """Wait up to ``timeout`` seconds for ``event`` on the running loop; return whether it was set.
+
+    The wait is a series of short asyncio.sleep calls rather than a blocking wait in a
+    worker thread, so it ends as soon as the task is cancelled and holds no thread.
+    """
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout
+    while not event.is_set():
+        remaining = end - loop.time()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(remaining, _CANCEL_POLL_INTERVAL))
+    return True
+
+
+def _parse_retry_after(value: str) -> float | None:
+    """Parse a Retry-After header value into a delay in seconds.
+
+    RFC 7231 allows either delta-seconds (``"120"``) or an HTTP-date
+    (``"Fri, 31 Dec 1999 23:59:59 GMT"``). Dates in the past yield ``0.0``;
+    negative and non-finite delays are rejected.
+
+    Returns:
+        The delay in seconds, or None if the value cannot be parsed
+    """
+    if value.isdecimal():
+        # Whole seconds are by far the most common form; skip float() and its error path
+        try:
+            return float(int(value))
+        except ValueError:
+            # More digits than CPython's int/str conversion limit allows
+            return None
+
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        # Negative, NaN, and infinite delays (e.g. "inf", "1e400") are invalid
+        return seconds if math.isfinite(seconds) and seconds >= 0 else None
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        # HTTP-dates are always GMT; naive results come from "-0000" offsets
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Thread-safe token bucket that limits how often retries may be attempted.
+
+    Each retry spends one token and each successful call earns a fraction of one back,
+    while tokens also refill steadily over time. Share one bucket between the retry
+    decorators that talk to the same backend: while it is empty, failures are raised
+    immediately instead of waiting through the backoff schedule, which bounds the retry
+    load a degraded service receives.
+
+    Args:
+        refill_per_sec: Tokens added per second, up to capacity
+        capacity: Maximum number of tokens, which is also the starting amount
+        clock: Monotonic time source (default: time.monotonic)
+    """
+
+    def __init__(self, refill_per_sec: float, capacity: float, *, clock: Callable[[], float] = time.monotonic) -> None:
+        if refill_per_sec < 0:
+            raise ValueError("refill_per_sec must be non-negative")
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.refill_per_sec = refill_per_sec
+        self.capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        """The number of tokens currently available."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_sec)
+        self._updated = now
+
+    def try_acquire(self, amount: float = 1.0) -> bool:
+        """Take ``amount`` tokens if that many are available; return whether they were taken."""
+        with self._lock:
+            self._refill()
+            if self._tokens < amount:
+                return False
+            self._tokens -= amount
+            return True
+
+    def credit(self, amount: float = 0.1) -> None:
+        """Return ``amount`` tokens to the bucket, up to capacity."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+@dataclass(frozen=True, slots=True)
+class RetryEvent:
+    """A retry about to be made, as reported to an ``on_retry`` callback.
+
+    Attributes:
+        attempt: Number of the retry, starting at 1
+        delay: Seconds the decorator waits before the retry
+        exception: The error that triggered the retry
+        reason: ``"retry_after"`` when the delay comes from a Retry-After header,
+            ``"rate_limit"`` for backoff after a rate limit error without a usable one,
+            and ``"network"`` for backoff after any other retryable error
+    """
+
+    attempt: int
+    delay: float
+    exception: Exception
+    reason: RetryReason
+
+
+class _RetryGate:
+    """A retry shared by concurrent calls that failed against the same endpoint.
+
+    The call that opened the gate backs off and retries as usual; the others wait on
+    ``event`` and then take its final result or error. If the opening call is interrupted
+    (cancelled, or stopped by KeyboardInterrupt) the gate closes unsettled, and waiters
+    go on retrying by themselves.
+    """
+
+    __slots__ = ("key", "event", "waiters", "settled", "result", "error")
+
+    def __init__(self, key: tuple[Hashable, ...], event: threading.Event | asyncio.Event) -> None:
+        self.key = key
+        self.event = event
+        self.waiters = 0
+        self.settled = False
+        self.result: Any = None
+        self.error: Exception | None = None
+
+    def outcome(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.result
+
 
 def retry_with_backoff(
     max_retries: int = 3,
     initial_delay: float = 1.0,
     max_delay: float = 60.0,
     exponential_base: float = 2.0,
-    retry_on: tuple[type[Exception], ...] = (CursorNetworkError, CursorRateLimitError),
+    retry_on: Iterable[type[Exception]] = (CursorNetworkError, CursorRateLimitError),
+    jitter: float = 0.5,
+    deadline: float | None = None,
+    cancel_event: threading.Event | None = None,
+    respect_retry_after_over_cap: bool = True,
+    retry_after_cap: float | None = None,
+    sleep: Callable[[float], Any] | None = None,
+    clock: Callable[[], float] = time.monotonic,
+    rng: random.Random | None = None,
+    idempotent_methods: Iterable[str] = _IDEMPOTENT_METHODS,
+    retry_bucket: TokenBucket | None = None,
+    coalesce_retries: bool = False,
+    coalesce_key: Callable[..., Hashable] | None = None,
+    on_retry: Callable[[RetryEvent], Any] | None = None,
 ) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """Decorator to retry a function with exponential backoff.
 
+    Coroutine functions are detected and get an async wrapper that waits with
+    ``asyncio.sleep``, so retries never block the event loop.
+
     Args:
         max_retries: Maximum number of retry attempts (default: 3)
         initial_delay: Initial delay in seconds before first retry (default: 1.0)
-        max_delay: Maximum delay in seconds between retries (default: 60.0)
+        max_delay: Maximum backoff delay in seconds between retries (default: 60.0). A longer
+            Retry-After is governed by respect_retry_after_over_cap and retry_after_cap.
         exponential_base: Base for exponential backoff calculation (default: 2.0)
-        retry_on: Tuple of exception types to retry on (default: network and rate limit errors)
+        retry_on: Exception types to retry on (default: network and rate limit errors)
+        jitter: Fraction of each backoff delay that is randomized, between 0.0 and 1.0
+            (default: 0.5). A delay ``d`` becomes a random value in ``[d * (1 - jitter), d]``,
+            so ``0.0`` disables jitter and ``1.0`` selects full jitter. Delays taken from a
+            Retry-After header are never jittered.
+        deadline: Total time budget in seconds for all attempts, measured with
+            ``clock`` from the first call (default: None, no budget). Backoff
+            delays are shortened to fit the budget, and once it is spent the last
+            exception is raised without sleeping.
+        cancel_event: Event that interrupts a pending backoff (default: None). When it is
+            set, a retry in progress stops waiting and the last exception is raised
+            immediately, e.g. to let a worker thread exit promptly on shutdown. Coroutine
+            functions check the event every 50ms while they back off.
+        respect_retry_after_over_cap: Whether a Retry-After longer than max_delay is honored
+            in full, up to one day (default: True). When False it is clamped to max_delay,
+            which risks retrying before the server's cooldown ends.
+        retry_after_cap: Longest Retry-After in seconds worth waiting for (default: None, no
+            limit). A longer Retry-After re-raises the rate limit error immediately so the
+            caller can reschedule the work.
+        sleep: Function called with each backoff delay in seconds (default: None, which uses
+            time.sleep, or asyncio.sleep when decorating a coroutine function). For coroutine
+            functions it may return an awaitable, which is awaited. Not used when
+            cancel_event is given, since waiting happens on the event.
+        clock: Monotonic time source used for the deadline (default: time.monotonic).
+            Together with sleep this lets tests run retries without real waits.
+        rng: Random number generator used for jitter (default: None, the ``random``
+            module's shared generator). Pass a seeded ``random.Random`` for reproducible delays.
+        idempotent_methods: HTTP methods that are retried after a network error (default: GET,
+            HEAD, PUT, DELETE, and OPTIONS). A failed request with any other method, such as
+            POST, may already have taken effect on the server, so its network error is raised
+            immediately unless the request carried an Idempotency-Key header.
+        retry_bucket: Token bucket that every retry must take a token from (default: None, no
+            limit). When it is empty the last exception is raised without sleeping, and
+            each successful call credits the bucket.
+        coalesce_retries: Whether concurrent calls failing against the same endpoint share one
+            retry (default: False). The first call to fail backs off and retries; calls that
+            fail with an error for the same (method, url) meanwhile wait for it and return its
+            result or raise its error, so a throttled endpoint sees one retry instead of one
+            per caller (and only that retry takes a retry_bucket token). If the retrying call
+            is cancelled or interrupted, the waiting calls retry by themselves instead.
+            Calls only share a retry when they were made with equal arguments, and coroutines
+            only with coroutines running on the same event loop. A call whose arguments are
+            not hashable retries by itself.
+        coalesce_key: Function called with the decorated function's arguments that returns a
+            hashable key for them (default: None, which compares the arguments themselves).
+            Calls only share a retry when their keys are equal, so return the same key only
+            for calls that send the same request.
+        on_retry: Function called with a RetryEvent before each backoff (default: None), e.g.
+            to record retries in metrics or logs.
 
     Returns:
-        Decorated function that will retry on specified exceptions
+        Decorated function that will retry on specified exceptions. Its ``_schedule``
+        attribute holds the backoff delay before each retry, prior to jitter.
+
+    Raises:
+        ValueError: If jitter is outside the range [0.0, 1.0]
 
     Example:
         ```python
         @retry_with_backoff(max_retries=5, initial_delay=0.5)
         def make_request():
             return client.get_v0_me()
+
+        @retry_with_backoff(max_retries=5, initial_delay=0.5)
+        async def make_async_request():
+            return await async_client.get_v0_me()
         ```
     """
+    if not 0.0 <= jitter <= 1.0:
+        raise ValueError("jitter must be between 0.0 and 1.0")
+    retry_types = tuple(retry_on)
+    idempotent_methods = frozenset(method.upper() for method in idempotent_methods)
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
-        @wraps(func)
-        def wrapper(*args: Any, **kwargs: Any) -> T:
-            last_exception: Exception | None = None
-            delay = initial_delay
+        # Backoff delay before retry N is fixed by the settings, so compute the schedule once
+        schedule = _backoff_delays(max_retries, initial_delay, max_delay, exponential_base)
+        # Exact-type membership avoids an isinstance() MRO walk for the common leaf classes
+        leaf_types = frozenset(retry_types)
+        uniform = random.uniform if rng is None else rng.uniform
+
+        def compute_delay(
+            e: Exception, base_delay: float, deadline_at: float | None
+        ) -> tuple[float, RetryReason] | None:
+            """Return how long to wait before retrying after ``e`` and why, or None if it should be raised."""
+            if type(e) not in leaf_types and not isinstance(e, retry_types):
+                return None
+
+            if (
+                isinstance(e, CursorNetworkError)
+                and e.method is not None
+                and e.method.upper() not in idempotent_methods
+                and not e.idempotency_key
+            ):
+                # The request may have reached the server; resending it could repeat its side effects
+                return None
+
+            # For rate limit errors, use longer delay
+            if isinstance(e, CursorRateLimitError):
+                # Use Retry-After header if available, otherwise use exponential backoff
+                retry_after = None
+                headers = e.headers
+                if headers:
+                    # Headers are case-insensitive
+                    retry_after_str = headers.get("Retry-After") or headers.get("retry-after")
+                    if retry_after_str:
+                        retry_after = _parse_retry_after(retry_after_str)
+
+                if retry_after:
+                    if retry_after_cap is not None and retry_after > retry_after_cap:
+                        # Cooldown is longer than the caller is willing to wait: fail fast
+                        return None
+                    if retry_after > max_delay and not respect_retry_after_over_cap:
+                        delay = max_delay
+                    else:
+                        delay = min(retry_after, _MAX_RETRY_AFTER)
+                    reason: RetryReason = "retry_after"
+                else:
+                    # Exponential backoff for rate limits
+                    delay = _jittered(base_delay, jitter, uniform)
+                    reason = "rate_limit"
+            else:
+                # Exponential backoff for network errors
+                delay = _jittered(base_delay, jitter, uniform)
+                reason = "network"
+
+            if deadline_at is not None:
+                remaining = deadline_at - clock()
+                if remaining <= 0:
+                    return None
+                delay = min(delay, remaining)
+            return delay, reason
+
+        # Shared retries in progress, by scope (loop and call arguments) and the failed request's (method, url)
+        gates: dict[tuple[Hashable, ...], _RetryGate] = {}
+        gates_lock = threading.Lock()
+
+        def join_gate(
+            e: Exception, scope: Hashable, new_event: Callable[[], threading.Event | asyncio.Event]
+        ) -> tuple[_RetryGate | None, _RetryGate | None]:
+            """Return ``(shared, opened)``: a gate another call opened for e's endpoint, or one opened here.
+
+            Only calls with the same ``scope`` share a gate. Coroutines include their running
+            loop, since an asyncio.Event can only wake the loop it is awaited on.
+            """
+            method, url = getattr(e, "method", None), getattr(e, "url", None)
+            if method is None or url is None:
+                return None, None
+            key = (scope, method, url)
+            try:
+                hash(key)
+            except TypeError:
+                # Unhashable arguments can't be compared, so this call retries by itself
+                return None, None
+            with gates_lock:
+                shared = gates.get(key)
+                if shared is not None:
+                    shared.waiters += 1
+                    return shared, None
+                opened = gates[key] = _RetryGate(key, new_event())
+                return None, opened
+
+        def call_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+            """Identify a call by its arguments, so calls that send different requests never share a retry."""
+            if coalesce_key is not None:
+                return coalesce_key(*args, **kwargs)
+            return args, tuple(sorted(kwargs.items()))
+
+        def close_gate(
+            gate: _RetryGate, *, result: Any = None, error: Exception | None = None, settled: bool = True
+        ) -> None:
+            with gates_lock:
+                del gates[gate.key]
+            gate.settled, gate.result, gate.error = settled, result, error
+            gate.event.set()
+
+        def succeeded(result: T) -> T:
+            """Credit the retry bucket for a successful call and pass its result through."""
+            if retry_bucket is not None:
+                retry_bucket.credit()
+            return result
+
+        if inspect.iscoroutinefunction(func):
+            async_sleep = asyncio.sleep if sleep is None else sleep
+
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                deadline_at = None if deadline is None else clock() + deadline
+                gate: _RetryGate | None = None  # Opened by this call when its retry is shared
 
-            for attempt in range(max_retries + 1):
                 try:
-                    return func(*args, **kwargs)
-                except retry_on as e:
-                    last_exception = e
-
-                    # Don't retry on the last attempt
-                    if attempt == max_retries:
-                        raise
-
-                    # For rate limit errors, use longer delay
-                    if isinstance(e, CursorRateLimitError):
-                        # Use Retry-After header if available, otherwise use exponential backoff
-                        retry_after = None
-                        if hasattr(e, "headers") and e.headers:
-                            # Headers are case-insensitive
-                            retry_after_str = e.headers.get("Retry-After") or e.headers.get("retry-after")
-                            if retry_after_str:
-                                try:
-                                    retry_after = float(retry_after_str)
-                                except (ValueError, TypeError):
-                                    pass
-
-                        if retry_after:
-                            delay = min(retry_after, max_delay)
+                    for attempt, base_delay in enumerate(schedule, 1):
+                        try:
+                            result = await func(*args, **kwargs)
+                        except Exception as e:
+                            decision = compute_delay(e, base_delay, deadline_at)
+                            if decision is None:
+                                raise
+                            delay, reason = decision
+
+                            if coalesce_retries and gate is None:
+                                shared, gate = join_gate(
+                                    e, (asyncio.get_running_loop(), call_key(args, kwargs)), asyncio.Event
+                                )
+                                if shared is not None:
+                                    # Another call is already retrying this endpoint: take its outcome
+                                    await shared.event.wait()  # type: ignore[misc]
+                                    if shared.settled:
+                                        return shared.outcome()
+
+                            if retry_bucket is not None and not retry_bucket.try_acquire():
+                                # Retries are being spent faster than calls succeed: fail fast
+                                raise
+                            if on_retry is not None:
+                                on_retry(RetryEvent(attempt, delay, e, reason))
+                            if cancel_event is None:
+                                slept = async_sleep(delay)
+                                if inspect.isawaitable(slept):
+                                    await slept
+                            elif await _wait_for_event(cancel_event, delay):
+                                raise
                         else:
-                            # Exponential backoff for rate limits
-                            delay = min(initial_delay * (exponential_base ** attempt), max_delay)
+                            break
                     else:
-                        # Exponential backoff for network errors
-                        delay = min(initial_delay * (exponential_base ** attempt), max_delay)
+                        # Final attempt: nothing left to retry, so errors propagate
+                        result = await func(*args, **kwargs)
+                except Exception as e:
+                    if gate is not None:
+                        close_gate(gate, error=e)
+                    raise
+                except BaseException:
+                    if gate is not None:
+                        # Cancelled or interrupted: don't pass that on, let waiters retry by themselves
+                        close_gate(gate, settled=False)
+                    raise
 
-                    time.sleep(delay)
+                if gate is not None:
+                    close_gate(gate, result=result)
+                return succeeded(result)
+
+            async_wrapper._schedule = schedule  # type: ignore[attr-defined]
+            async_wrapper._retry_gates = gates  # type: ignore[attr-defined]
+            return async_wrapper  # type: ignore[return-value]
+
+        sync_sleep = time.sleep if sleep is None else sleep
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            deadline_at = None if deadline is None else clock() + deadline
+            gate: _RetryGate | None = None  # Opened by this call when its retry is shared
+
+            try:
+                for attempt, base_delay in enumerate(schedule, 1):
+                    try:
+                        result = func(*args, **kwargs)
+                    except Exception as e:
+                        decision = compute_delay(e, base_delay, deadline_at)
+                        if decision is None:
+                            raise
+                        delay, reason = decision
+
+                        if coalesce_retries and gate is None:
+                            shared, gate = join_gate(e, call_key(args, kwargs), threading.Event)
+                            if shared is not None:
+                                # Another call is already retrying this endpoint: take its outcome
+                                shared.event.wait()
+                                if shared.settled:
+                                    return shared.outcome()  # type: ignore[no-any-return]
+
+                        if retry_bucket is not None and not retry_bucket.try_acquire():
+                            # Retries are being spent faster than calls succeed: fail fast
+                            raise
+                        if on_retry is not None:
+                            on_retry(RetryEvent(attempt, delay, e, reason))
+                        if cancel_event is None:
+                            sync_sleep(delay)
+                        elif cancel_event.wait(delay):
+                            raise
+                    else:
+                        break
+                else:
+                    # Final attempt: nothing left to retry, so errors propagate
+                    result = func(*args, **kwargs)
+            except Exception as e:
+                if gate is not None:
+                    close_gate(gate, error=e)
+                raise
+            except BaseException:
+                if gate is not None:
+                    # Cancelled or interrupted: don't pass that on, let waiters retry by themselves
+                    close_gate(gate, settled=False)
+                raise
 
-            # This should never be reached, but type checker needs it
-            if last_exception:  # pragma: no cover
-                raise last_exception
-            raise RuntimeError("Retry logic failed unexpectedly")  # pragma: no cover
+            if gate is not None:
+                close_gate(gate, result=result)
+            return succeeded(result)
 
+        # The pre-jitter backoff delay before each retry, e.g. (1.0, 2.0, 4.0)
+        wrapper._schedule = schedule  # type: ignore[attr-defined]
+        # Shared retries in progress when coalesce_retries is enabled
+        wrapper._retry_gates = gates  # type: ignore[attr-defined]
         return wrapper
 
     return decorator
@@ -9,6 +9,8 @@ To run:
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator
 
 import pytest
 
@@ -26,7 +28,7 @@ pytestmark = [
 ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def api_key() -> str:
     """Get API key from environment variable."""
     key = os.getenv("CURSOR_API_KEY")
@@ -35,13 +37,33 @@ def api_key() -> str:
     return key
 
 
-@pytest.fixture
-def client(api_key: str) -> CursorClient:
-    """Create a client instance with real API key."""
-    return CursorClient(api_key, base_url="https://api.cursor.com")
+@pytest.fixture(scope="session")
+def client(api_key: str) -> Iterator[CursorClient]:
+    """Create one client shared by the session so connections are reused."""
+    client = CursorClient(api_key, base_url="https://api.cursor.com")
+    yield client
+    client.close()
 
 
-def test_create_agent_on_cursor_test_repo(client: CursorClient) -> None:
+@pytest.fixture(scope="session")
+def created_agents(client: CursorClient) -> Iterator[list[str]]:
+    """Collect IDs of agents created by tests and delete them all at session teardown."""
+    agent_ids: list[str] = []
+    yield agent_ids
+
+    def delete(agent_id: str) -> None:
+        try:
+            client.delete_v0_agents_id(agent_id)
+        except Exception:
+            # If deletion fails, that's ok - agent might have already finished/deleted
+            pass
+
+    # Deletes run concurrently over the shared client's connection pool
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(delete, agent_ids))
+
+
+def test_create_agent_on_cursor_test_repo(client: CursorClient, created_agents: list[str]) -> None:
     """Test creating an agent on the cursor-test repository."""
     # Create an agent pointing at the cursor-test repo
     agent_data = {
@@ -65,18 +87,12 @@ def test_create_agent_on_cursor_test_repo(client: CursorClient) -> None:
         assert result is not None
         assert isinstance(result, dict)
         assert "id" in result
-        agent_id = result["id"]
+        # Deleted at session teardown, even if an assertion below fails
+        created_agents.append(result["id"])
         
         # Verify the agent was created with correct repository
         assert "source" in result
         assert result["source"]["repository"] == "https://github.com/actuallyrizzn/cursor-test"
-        
-        # Clean up: delete the agent
-        try:
-            client.delete_v0_agents_id(agent_id)
-        except Exception:
-            # If deletion fails, that's ok - agent might have already finished/deleted
-            pass
             
     except CursorRateLimitError:
         pytest.skip("Rate limited on POST /v0/agents")
@@ -87,11 +103,9 @@ def test_create_agent_on_cursor_test_repo(client: CursorClient) -> None:
         # Other API errors (400, 404, 500, etc.) - verify error structure
         assert e.status_code >= 400
         assert e.message is not None
-    finally:
-        client.close()
 
 
-def test_create_agent_and_check_status(client: CursorClient) -> None:
+def test_create_agent_and_check_status(client: CursorClient, created_agents: list[str]) -> None:
     """Test creating an agent and checking its status."""
     agent_data = {
         "prompt": {
@@ -111,6 +125,7 @@ def test_create_agent_and_check_status(client: CursorClient) -> None:
             pytest.skip("Failed to create agent")
             
         agent_id = create_result["id"]
+        created_agents.append(agent_id)
         
         # Check agent status
         status_result = client.get_v0_agents_id(agent_id)
@@ -119,12 +134,6 @@ def test_create_agent_and_check_status(client: CursorClient) -> None:
         assert isinstance(status_result, dict)
         assert status_result["id"] == agent_id
         assert "status" in status_result
-        
-        # Clean up
-        try:
-            client.delete_v0_agents_id(agent_id)
-        except Exception:
-            pass
             
     except CursorRateLimitError:
         pytest.skip("Rate limited")
@@ -133,6 +142,3 @@ def test_create_agent_and_check_status(client: CursorClient) -> None:
     except CursorAPIError as e:
         # Acceptable - just verify error structure
         assert e.status_code >= 400
-    finally:
-        client.close()
-
@@ -12,6 +12,7 @@ To run these tests:
 """
 
 import os
+from typing import Iterator
 
 import pytest
 
@@ -29,7 +30,7 @@ pytestmark = [
 ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def api_key() -> str:
     """Get API key from environment variable."""
     key = os.getenv("CURSOR_API_KEY")
@@ -38,10 +39,12 @@ def api_key() -> str:
     return key
 
 
-@pytest.fixture
-def client(api_key: str) -> CursorClient:
-    """Create a client instance with real API key."""
-    return CursorClient(api_key, base_url="https://api.cursor.com")
+@pytest.fixture(scope="session")
+def client(api_key: str) -> Iterator[CursorClient]:
+    """Create one client shared by the session so connections are reused."""
+    client = CursorClient(api_key, base_url="https://api.cursor.com")
+    yield client
+    client.close()
 
 
 class TestRealAPIE2E:
@@ -52,7 +55,6 @@ class TestRealAPIE2E:
         result = client.get_v0_me()
         assert result is not None
         assert isinstance(result, dict)
-        client.close()
 
     def test_complete_round_trip_get_v0_agents(self, client: CursorClient) -> None:
         """Test complete round trip for GET /v0/agents."""
@@ -60,7 +62,6 @@ class TestRealAPIE2E:
         assert result is not None
         # Should be a list or dict
         assert isinstance(result, (dict, list))
-        client.close()
 
     def test_complete_round_trip_get_v0_repositories(self, client: CursorClient) -> None:
         """Test complete round trip for GET /v0/repositories."""
@@ -72,8 +73,6 @@ class TestRealAPIE2E:
         except CursorRateLimitError:
             # This endpoint has strict rate limits (1 req/min), so rate limit is acceptable
             pytest.skip("Rate limited on /v0/repositories endpoint")
-        finally:
-            client.close()
 
     def test_complete_round_trip_get_v0_models(self, client: CursorClient) -> None:
         """Test complete round trip for GET /v0/models."""
@@ -81,7 +80,6 @@ class TestRealAPIE2E:
         assert result is not None
         # Should be a list or dict
         assert isinstance(result, (dict, list))
-        client.close()
 
     def test_context_manager_works(self, api_key: str) -> None:
         """Test that context manager works with real API."""
@@ -106,8 +104,6 @@ class TestRealAPIE2E:
         assert result1 is not None
         assert result2 is not None
 
-        client.close()
-
     def test_error_handling_unauthorized(self) -> None:
         """Test error handling for unauthorized requests."""
         client = CursorClient("invalid_key_for_testing", base_url="https://api.cursor.com")
@@ -130,20 +126,14 @@ class TestRealAPIE2E:
         except CursorAPIError:
             # Other API errors are also acceptable
             pass
-        finally:
-            client.close()
 
-    def test_retry_logic_with_real_api(self, api_key: str) -> None:
+    def test_retry_logic_with_real_api(self, client: CursorClient) -> None:
         """Test retry logic with real API (if applicable)."""
         from cursor_sdk.retry import retry_with_backoff
 
-        client = CursorClient(api_key, base_url="https://api.cursor.com")
-
         @retry_with_backoff(max_retries=3, initial_delay=0.1)
         def make_request() -> dict:
             return client.get_v0_me()
 
         result = make_request()
         assert result is not None
-        client.close()
-
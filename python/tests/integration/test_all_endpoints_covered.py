@@ -1,9 +1,11 @@
+import asyncio
 import json
 from pathlib import Path
 
 import httpx
 import pytest
 
+from cursor_sdk import AsyncCursorClient
 from cursor_sdk.client import ENDPOINT_SPECS, CursorClient, EndpointSpec
 
 
@@ -62,3 +64,39 @@ def test_each_endpoint_method_emits_correct_request(spec: EndpointSpec) -> None:
     else:
         assert result == {"ok": True}
     client.close()
+
+
+@pytest.mark.parametrize("spec", ENDPOINT_SPECS)
+def test_each_async_endpoint_method_emits_correct_request(spec: EndpointSpec) -> None:
+    method = spec.method
+    path = spec.path
+    expected_path = path.replace(":repoId", "repo").replace(":groupId", "group")
+    expected_path = expected_path.replace("{id}", "id")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.method == method
+        assert request.url.path == expected_path
+        if path.endswith(".csv"):
+            return httpx.Response(200, content=b"a,b\n1,2\n", headers={"content-type": "text/csv"})
+        return httpx.Response(200, json={"ok": True}, headers={"content-type": "application/json"})
+
+    kwargs = {}
+    if ":repoId" in path:
+        kwargs["repo_id"] = "repo"
+    if ":groupId" in path:
+        kwargs["group_id"] = "group"
+    if "{id}" in path:
+        kwargs["id"] = "id"
+
+    async def run() -> object:
+        async with AsyncCursorClient("k", base_url="https://example.test", transport=httpx.MockTransport(handler)) as client:
+            fn = getattr(client, spec.method_name)
+            if method in ("POST", "PATCH"):
+                return await fn(**kwargs, json={"ok": 1})
+            return await fn(**kwargs)
+
+    result = asyncio.run(run())
+    if path.endswith(".csv"):
+        assert result == "a,b\n1,2\n"
+    else:
+        assert result == {"ok": True}
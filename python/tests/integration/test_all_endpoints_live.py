@@ -1,7 +1,8 @@
 """Test all endpoints against the real Cursor API.
 
-This test file uses parametrization to test every endpoint in ENDPOINT_SPECS
-against the real API. Tests are skipped if CURSOR_API_KEY is not set.
+This test file calls every endpoint in ENDPOINT_SPECS concurrently against the
+real API and reports failures per endpoint. Tests are skipped if CURSOR_API_KEY
+is not set.
 
 To run:
     export CURSOR_API_KEY=your_api_key_here
@@ -9,11 +10,13 @@ To run:
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, NamedTuple, Optional
 
 import pytest
 
 from cursor_sdk import CursorClient
-from cursor_sdk.client import ENDPOINT_SPECS
+from cursor_sdk.client import ENDPOINT_SPECS, EndpointSpec
 from cursor_sdk.errors import CursorAPIError, CursorAuthError, CursorRateLimitError
 
 
@@ -27,7 +30,7 @@ pytestmark = [
 ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def api_key() -> str:
     """Get API key from environment variable."""
     key = os.getenv("CURSOR_API_KEY")
@@ -36,72 +39,72 @@ def api_key() -> str:
     return key
 
 
-@pytest.fixture
-def client(api_key: str) -> CursorClient:
-    """Create a client instance with real API key."""
-    return CursorClient(api_key, base_url="https://api.cursor.com")
-
-
-@pytest.mark.parametrize("spec", ENDPOINT_SPECS)
-def test_endpoint_live(spec, client: CursorClient) -> None:
-    """Test each endpoint against the real API."""
-    method = spec.method
-    path = spec.path
-    method_name = spec.method_name
-    
-    # Get the method from the client
-    endpoint_method = getattr(client, method_name)
-    
-    # Prepare arguments based on path parameters
-    kwargs = {}
-    if ":repoId" in path:
-        kwargs["repo_id"] = "test_repo_id"
-    if ":groupId" in path:
-        kwargs["group_id"] = "test_group_id"
-    if "{id}" in path:
-        kwargs["id"] = "test_id"
-    
-    # For POST/PATCH, add proper JSON body based on endpoint
-    if method in ("POST", "PATCH"):
-        if path == "/v0/agents":
-            # POST /v0/agents requires prompt and source
-            kwargs["json"] = {
-                "prompt": {"text": "Test agent creation"},
-                "source": {"repository": "https://github.com/actuallyrizzn/cursor-test", "ref": "main"}
-            }
-        elif path == "/v0/agents/{id}/followup":
-            # POST /v0/agents/{id}/followup requires prompt
-            kwargs["json"] = {"prompt": {"text": "Test followup"}}
-        elif path == "/bugbot/repo/update":
-            # POST /bugbot/repo/update requires repoUrl and enabled
-            kwargs["json"] = {"repoUrl": "https://github.com/actuallyrizzn/cursor-test", "enabled": False}
-        elif path == "/settings/repo-blocklists/repos/upsert":
-            # POST /settings/repo-blocklists/repos/upsert requires repo data
-            kwargs["json"] = {"repository": "https://github.com/actuallyrizzn/cursor-test"}
-        elif path == "/teams/groups" and method == "POST":
-            # POST /teams/groups requires name
-            kwargs["json"] = {"name": "Test Group"}
-        elif path == "/teams/groups/:groupId" and method == "PATCH":
-            # PATCH /teams/groups/:groupId requires update data
-            kwargs["json"] = {"name": "Updated Test Group"}
-        elif path == "/teams/groups/:groupId/members" and method == "POST":
-            # POST /teams/groups/:groupId/members requires member data
-            kwargs["json"] = {"userId": "test_user_id"}
-        else:
-            # For other POST/PATCH endpoints, try empty object
-            kwargs["json"] = {}
-    
+@pytest.fixture(scope="session")
+def client(api_key: str) -> Iterator[CursorClient]:
+    """Create one client shared by all live endpoint calls."""
+    client = CursorClient(api_key, base_url="https://api.cursor.com")
+    yield client
+    client.close()
+
+
+class EndpointPlan(NamedTuple):
+    """Precomputed arguments for calling one endpoint against the real API."""
+
+    kwargs: dict[str, Any]
+
+
+# Placeholder values for path parameters, keyed by how they appear in path templates
+_PATH_PARAMS = {":repoId": ("repo_id", "test_repo_id"), ":groupId": ("group_id", "test_group_id"), "{id}": ("id", "test_id")}
+
+# Request bodies the live API requires for POST/PATCH endpoints; others send an empty object
+_JSON_BODIES: dict[tuple[str, str], Any] = {
+    # POST /v0/agents requires prompt and source
+    ("POST", "/v0/agents"): {
+        "prompt": {"text": "Test agent creation"},
+        "source": {"repository": "https://github.com/actuallyrizzn/cursor-test", "ref": "main"}
+    },
+    # POST /v0/agents/{id}/followup requires prompt
+    ("POST", "/v0/agents/{id}/followup"): {"prompt": {"text": "Test followup"}},
+    # POST /bugbot/repo/update requires repoUrl and enabled
+    ("POST", "/bugbot/repo/update"): {"repoUrl": "https://github.com/actuallyrizzn/cursor-test", "enabled": False},
+    # POST /settings/repo-blocklists/repos/upsert requires repo data
+    ("POST", "/settings/repo-blocklists/repos/upsert"): {"repository": "https://github.com/actuallyrizzn/cursor-test"},
+    # POST /teams/groups requires name
+    ("POST", "/teams/groups"): {"name": "Test Group"},
+    # PATCH /teams/groups/:groupId requires update data
+    ("PATCH", "/teams/groups/:groupId"): {"name": "Updated Test Group"},
+    # POST /teams/groups/:groupId/members requires member data
+    ("POST", "/teams/groups/:groupId/members"): {"userId": "test_user_id"},
+}
+
+
+def _plan(spec: EndpointSpec) -> EndpointPlan:
+    """Build the arguments used to call an endpoint against the real API."""
+    kwargs: dict[str, Any] = {
+        name: value for placeholder, (name, value) in _PATH_PARAMS.items() if placeholder in spec.path
+    }
+    if spec.method in ("POST", "PATCH"):
+        kwargs["json"] = _JSON_BODIES.get((spec.method, spec.path), {})
+    return EndpointPlan(kwargs)
+
+
+# Built once at import; the same path can appear under several methods, so key by spec
+SPEC_PLAN: dict[EndpointSpec, EndpointPlan] = {spec: _plan(spec) for spec in ENDPOINT_SPECS}
+
+
+def _call_endpoint(client: CursorClient, spec: EndpointSpec) -> Optional[str]:
+    """Call one endpoint and return a failure description, or None if it behaved."""
+    endpoint_method = getattr(client, spec.method_name)
     try:
-        # Call the endpoint
-        result = endpoint_method(**kwargs)
-        
+        result = endpoint_method(**SPEC_PLAN[spec].kwargs.copy())
+
         # Verify we got a response (could be dict, list, str, or None)
         # None is valid for empty responses or 304 Not Modified
-        assert result is None or isinstance(result, (dict, list, str))
-        
+        if not (result is None or isinstance(result, (dict, list, str))):
+            return f"unexpected result type {type(result).__name__}"
     except CursorRateLimitError:
-        # Rate limiting is acceptable - skip the test
-        pytest.skip(f"Rate limited on {method} {path}")
+        # Rate limiting is acceptable
+        pass
     except CursorAuthError:
         # Auth errors might indicate insufficient permissions - that's ok for testing
         # We just want to verify the endpoint method exists and can be called
@@ -110,17 +113,30 @@ def test_endpoint_live(spec, client: CursorClient) -> None:
         # Other API errors (400, 404, 500, etc.) are acceptable
         # The important thing is that the endpoint method works and makes the request
         # We verify the error has the expected structure
-        assert e.status_code >= 400
-        assert e.message is not None
-    finally:
-        # Clean up is handled by fixture, but we ensure client is still valid
-        pass
+        if e.status_code < 400 or e.message is None:
+            return f"malformed error {e!r}"
+    except Exception as e:  # Network errors and SDK bugs are reported per endpoint
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def test_endpoints_batch(client: CursorClient) -> None:
+    """Test every endpoint against the real API, dispatching calls concurrently.
+
+    Calls share one client (and its keep-alive connection pool), so the suite costs
+    roughly ceil(N / workers) round trips instead of N.
+    """
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outcomes = list(zip(ENDPOINT_SPECS, executor.map(lambda spec: _call_endpoint(client, spec), ENDPOINT_SPECS)))
+
+    failures = [f"{spec.method} {spec.path}: {failure}" for spec, failure in outcomes if failure is not None]
+    assert not failures, "Endpoints failed:\n" + "\n".join(failures)
 
 
 def test_all_endpoints_are_tested() -> None:
     """Verify that we're testing all endpoints."""
     # This test ensures ENDPOINT_SPECS hasn't changed without updating tests
-    # The parametrize above should cover all endpoints
+    # The batch test above should cover all endpoints
     assert len(ENDPOINT_SPECS) > 0
     # Count unique method+path combinations (some paths have multiple methods)
     unique_endpoints = {(spec.method, spec.path) for spec in ENDPOINT_SPECS}
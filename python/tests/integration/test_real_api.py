@@ -9,6 +9,7 @@ To run these tests:
 """
 
 import os
+from typing import Iterator
 
 import pytest
 
@@ -26,7 +27,7 @@ pytestmark = [
 ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def api_key() -> str:
     """Get API key from environment variable."""
     key = os.getenv("CURSOR_API_KEY")
@@ -35,10 +36,12 @@ def api_key() -> str:
     return key
 
 
-@pytest.fixture
-def client(api_key: str) -> CursorClient:
-    """Create a client instance with real API key."""
-    return CursorClient(api_key, base_url="https://api.cursor.com")
+@pytest.fixture(scope="session")
+def client(api_key: str) -> Iterator[CursorClient]:
+    """Create one client shared by the session so connections are reused."""
+    client = CursorClient(api_key, base_url="https://api.cursor.com")
+    yield client
+    client.close()
 
 
 def test_get_v0_me(client: CursorClient) -> None:
@@ -47,7 +50,6 @@ def test_get_v0_me(client: CursorClient) -> None:
     assert result is not None
     # Real API should return user information
     assert isinstance(result, dict)
-    client.close()
 
 
 def test_get_v0_models(client: CursorClient) -> None:
@@ -56,7 +58,6 @@ def test_get_v0_models(client: CursorClient) -> None:
     assert result is not None
     # Should return a list or dict of models
     assert isinstance(result, (dict, list))
-    client.close()
 
 
 def test_get_v0_repositories(client: CursorClient) -> None:
@@ -69,8 +70,6 @@ def test_get_v0_repositories(client: CursorClient) -> None:
     except CursorRateLimitError:
         # This endpoint has strict rate limits (1 req/min), so rate limit is acceptable
         pytest.skip("Rate limited on /v0/repositories endpoint")
-    finally:
-        client.close()
 
 
 def test_get_v0_agents(client: CursorClient) -> None:
@@ -79,7 +78,6 @@ def test_get_v0_agents(client: CursorClient) -> None:
     assert result is not None
     # Should return a list or dict of agents
     assert isinstance(result, (dict, list))
-    client.close()
 
 
 def test_basic_auth_works(client: CursorClient) -> None:
@@ -87,7 +85,6 @@ def test_basic_auth_works(client: CursorClient) -> None:
     # Client should already be using Basic auth by default
     result = client.get_v0_me()
     assert result is not None
-    client.close()
 
 
 def test_bearer_auth_works(api_key: str) -> None:
@@ -127,5 +124,3 @@ def test_response_structure_get_v0_me(client: CursorClient) -> None:
     assert isinstance(result, dict)
     # Real API response structure may vary, but should be a dict
     # Add more specific assertions based on actual API response
-    client.close()
-
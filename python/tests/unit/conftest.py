@@ -0,0 +1,43 @@
+"""Shared fixtures for unit tests."""
+
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+import httpx
+import pytest
+
+from cursor_sdk import CursorClient
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+# Handler answering requests sent through ``mock_client``; set per test via ``use_handler``
+_current_handler: ContextVar[Handler] = ContextVar("handler")
+
+
+def _dispatch(request: httpx.Request) -> httpx.Response:
+    return _current_handler.get()(request)
+
+
+@pytest.fixture(scope="module")
+def mock_client() -> Iterator[CursorClient]:
+    """One client per test module, backed by a transport that dispatches to the current handler."""
+    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(_dispatch))
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def use_handler() -> Iterator[Callable[[Handler], None]]:
+    """Install the handler that answers ``mock_client`` requests for the rest of the test.
+
+    The handler is kept in a context variable, so requests must be sent from the test's
+    own context (asyncio.run copies it; new threads do not).
+    """
+    tokens = []
+
+    def install(handler: Handler) -> None:
+        tokens.append(_current_handler.set(handler))
+
+    yield install
+    for token in reversed(tokens):
+        _current_handler.reset(token)
@@ -0,0 +1,425 @@
+"""Tests for the in-process response cache."""
+
+import logging
+import threading
+
+import httpx
+import pytest
+
+from cursor_sdk import CursorClient, ResponseCache
+from cursor_sdk.cache import cache_key
+from cursor_sdk.errors import CursorAPIError, CursorNetworkError
+
+
+class _Clock:
+    """Manually advanced clock for freshness tests."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_cache_key_normalizes_params_and_hashes_auth() -> None:
+    """Test that equivalent requests share a key and credentials are not stored."""
+    key1 = cache_key("get", "/v0/me", {"b": "2", "a": "1"}, {"Authorization": "Basic secret"})
+    key2 = cache_key("GET", "/v0/me", {"a": "1", "b": "2"}, {"authorization": "Basic secret"})
+    other_auth = cache_key("GET", "/v0/me", {"a": "1", "b": "2"}, {"Authorization": "Basic other"})
+
+    assert key1 == key2
+    assert key1 != other_auth
+    assert "Basic secret" not in repr(key1)
+
+
+def test_cache_invalid_arguments() -> None:
+    """Test that invalid cache settings are rejected."""
+    with pytest.raises(ValueError, match="maxsize"):
+        ResponseCache(0)
+    with pytest.raises(ValueError, match="non-negative"):
+        ResponseCache(ttl=-1.0)
+    with pytest.raises(ValueError, match="non-negative"):
+        ResponseCache(stale_while_revalidate=-1.0)
+    with pytest.raises(ValueError, match="non-negative"):
+        ResponseCache(stale_if_error=-1.0)
+
+
+def test_cache_entry_expires_after_ttl() -> None:
+    """Test that entries are dropped once their TTL and stale window pass."""
+    clock = _Clock()
+    cache = ResponseCache(ttl=10.0, clock=clock)
+    cache.set(("k",), {"ok": True})
+
+    clock.now = 9.0
+    entry = cache.get(("k",))
+    assert entry is not None
+    assert entry.is_fresh(clock.now)
+
+    clock.now = 10.0
+    assert cache.get(("k",)) is None
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_control_directives() -> None:
+    """Test max-age, stale-while-revalidate, no-cache, and no-store handling."""
+    clock = _Clock()
+    cache = ResponseCache(ttl=60.0, clock=clock)
+
+    cache.set(("swr",), "a", {"cache-control": 'public, max-age="5", stale-while-revalidate=10'})
+    entry = cache.get(("swr",))
+    assert entry is not None
+    assert (entry.fresh_until, entry.stale_until) == (5.0, 15.0)
+
+    cache.set(("no-cache",), "b", {"cache-control": "no-cache, stale-while-revalidate=30"})
+    entry = cache.get(("no-cache",))
+    assert entry is not None
+    assert not entry.is_fresh(clock.now)
+
+    cache.set(("no-store",), "c")
+    cache.set(("no-store",), "c", {"cache-control": "No-Store"})
+    assert cache.get(("no-store",)) is None
+
+
+@pytest.mark.parametrize("max_age", ["soon", "-5"])
+def test_cache_control_invalid_max_age_uses_default_ttl(max_age: str) -> None:
+    """Test that unusable max-age values fall back to the cache's TTL."""
+    cache = ResponseCache(ttl=60.0, clock=_Clock())
+    cache.set(("k",), "a", {"cache-control": f"max-age={max_age}"})
+    entry = cache.get(("k",))
+    assert entry is not None
+    assert entry.fresh_until == 60.0
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    """Test that the cache stays within maxsize, evicting the oldest entry."""
+    cache = ResponseCache(2, ttl=60.0, clock=_Clock())
+    cache.set(("a",), "1")
+    cache.set(("b",), "2")
+    assert cache.get(("a",)) is not None  # "b" is now least recently used
+    cache.set(("c",), "3")
+
+    assert len(cache) == 2
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) is not None
+
+    cache.delete(("a",))
+    assert cache.get(("a",)) is None
+    cache.clear()
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_client_serves_repeated_get_from_cache() -> None:
+    """Test that a cached GET does not hit the network again while fresh."""
+    call_count = {"value": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        call_count["value"] += 1
+        return httpx.Response(200, json={"call": call_count["value"]})
+
+    cache = ResponseCache(ttl=60.0)
+    client = CursorClient(
+        "test_key", base_url="https://example.test", transport=httpx.MockTransport(handler), cache=cache
+    )
+
+    assert client.get_v0_me() == {"call": 1}
+    assert client.get_v0_me() == {"call": 1}
+    # Different query parameters are cached separately
+    assert client.get_v0_me(params={"x": "1"}) == {"call": 2}
+    assert call_count["value"] == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    client.close()
+
+
+def test_client_does_not_cache_non_get_or_errors() -> None:
+    """Test that writes and error responses bypass the cache."""
+    call_count = {"value": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        call_count["value"] += 1
+        if request.url.path == "/teams/members":
+            return httpx.Response(500, json={"message": "Server error"})
+        return httpx.Response(200, json={"ok": True})
+
+    cache = ResponseCache()
+    client = CursorClient(
+        "test_key", base_url="https://example.test", transport=httpx.MockTransport(handler), cache=cache
+    )
+
+    assert client.post_teams_spend(json={}) == {"ok": True}
+    assert client.post_teams_spend(json={}) == {"ok": True}
+    for _ in range(2):
+        with pytest.raises(CursorAPIError):
+            client.get_teams_members()
+    assert call_count["value"] == 4
+    assert len(cache) == 0
+
+    client.close()
+
+
+def test_cache_default_ttl_skips_responses_without_freshness() -> None:
+    """Test that the default cache only stores responses it could serve or revalidate."""
+    cache = ResponseCache(clock=_Clock())
+    cache.set(("plain",), {"ok": True})
+    cache.set(("no-cache",), {"ok": True}, {"cache-control": "no-cache"})
+    assert len(cache) == 0
+
+    cache.set(("max-age",), {"ok": True}, {"cache-control": "max-age=10"})
+    cache.set(("etag",), {"ok": True}, {"etag": '"v1"'})
+    cache.set(("last-modified",), {"ok": True}, {"last-modified": "Wed, 21 Oct 2015 07:28:00 GMT"})
+    assert len(cache) == 3
+
+
+def test_client_write_invalidates_resource_and_collection() -> None:
+    """Test that a successful write evicts cached reads of the path, its children, and its parent."""
+    call_count = {"value": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        call_count["value"] += 1
+        if request.method == "DELETE" and request.url.path == "/v0/agents/a2":
+            return httpx.Response(500, json={"message": "Server error"})
+        return httpx.Response(200, json={"call": call_count["value"]})
+
+    cache = ResponseCache(ttl=60.0)
+    client = CursorClient(
+        "test_key", base_url="https://example.test", transport=httpx.MockTransport(handler), cache=cache
+    )
+
+    assert client.get_v0_agents() == {"call": 1}
+    assert client.get_v0_agents(params={"limit": "5"}) == {"call": 2}
+    assert client.get_v0_agents_id("a1") == {"call": 3}
+    assert client.get_v0_agents_id_conversation("a1") == {"call": 4}
+    assert client.get_v0_agents_id("a2") == {"call": 5}
+    assert client.get_v0_agents_id("a10") == {"call": 6}
+
+    # A failed write leaves the cache alone
+    with pytest.raises(CursorAPIError):
+        client.delete_v0_agents_id("a2")
+    assert len(cache) == 6
+
+    assert client.delete_v0_agents_id("a1") == {"call": 8}
+    assert len(cache) == 2
+    assert client.get_v0_agents_id("a2") == {"call": 5}
+    assert client.get_v0_agents_id("a10") == {"call": 6}
+    assert client.get_v0_agents() == {"call": 9}
+    assert client.get_v0_agents_id_conversation("a1") == {"call": 10}
+
+    # Writing to a collection evicts the collection and everything under it
+    assert client.post_v0_agents(json={}) == {"call": 11}
+    assert len(cache) == 0
+
+    client.close()
+
+
+def test_client_stale_while_revalidate_refreshes_in_background() -> None:
+    """Test that a stale hit is served immediately and refreshed once in the background."""
+    clock = _Clock()
+    call_count = {"value": 0}
+    refresh_started = threading.Event()
+    release_refresh = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        call_count["value"] += 1
+        if call_count["value"] == 2:
+            refresh_started.set()
+            release_refresh.wait(5.0)
+        return httpx.Response(
+            200,
+            json={"call": call_count["value"]},
+            headers={"cache-control": "max-age=10, stale-while-revalidate=20"},
+        )
+
+    cache = ResponseCache(clock=clock)
+    client = CursorClient(
+        "test_key", base_url="https://example.test", transport=httpx.MockTransport(handler), cache=cache
+    )
+
+    assert client.get_v0_models() == {"call": 1}
+
+    clock.now = 15.0
+    assert client.get_v0_models() == {"call": 1}  # Stale, refresh scheduled
+    assert refresh_started.wait(5.0)
+    assert client.get_v0_models() == {"call": 1}  # Refresh already in flight, not duplicated
+    release_refresh.set()
+
+    client.close()  # Waits for the refresh to finish
+    assert call_count["value"] == 2
+    entry = cache.get(cache_key("GET", "/v0/models", None, client._build_headers()))
+    assert entry is not None
+    assert entry.body == {"call": 2}
+
+
+def test_client_failed_background_refresh_keeps_stale_entry() -> None:
+    """Test that a failing refresh leaves the stale entry in place."""
+    clock = _Clock()
+    call_count = {"value": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        call_count["value"] += 1
+        if call_count["value"] > 1:
+            raise httpx.ConnectError("Connection failed", request=request)
+        return httpx.Response(200, json={"ok": True}, headers={"cache-control": "max-age=1, stale-while-revalidate=60"})
+
+    cache = ResponseCache(clock=clock)
+    client = CursorClient(
+        "test_key", base_url="https://example.test", transport=httpx.MockTransport(handler), cache=cache
+    )
+
+    assert client.get_v0_me() == {"ok": True}
+    clock.now = 5.0
+    assert client.get_v0_me() == {"ok": True}
+    client.close()
+
+    assert call_count["value"] == 2
+    assert len(cache) == 1
+
+
+def test_client_revalidates_expired_entry_with_etag() -> None:
+    """Test that an expired entry is revalidated with If-None-Match and a 304 reuses it."""
+    clock = _Clock()
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"cache-control": "max-age=30", "etag": '"v2"'})
+        return httpx.Response(200, json={"models": []}, headers={"cache-control": "max-age=10", "etag": '"v1"'})
+
+    cache = ResponseCache(clock=clock)
+    client = CursorClient(
+        "test_key", base_url="https://example.test", transport=httpx.MockTransport(handler), cache=cache
+    )
+
+    assert client.get_v0_models() == {"models": []}
+    clock.now = 20.0
+    assert client.get_v0_models() == {"models": []}
+    assert seen == [None, '"v1"']
+
+    # The 304 renewed freshness and replaced the validator
+    key = cache_key("GET", "/v0/models", None, client._build_headers())
+    entry = cache.get(key)
+    assert entry is not None
+    assert (entry.fresh_until, entry.etag) == (50.0, '"v2"')
+
+    client.close()
+
+
+def test_client_revalidates_with_last_modified_and_stores_new_body() -> None:
+    """Test If-Modified-Since revalidation when the resource has changed."""
+    clock = _Clock()
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("if-modified-since"))
+        return httpx.Response(
+            200,
+            json={"version": len(seen)},
+            headers={"cache-control": "max-age=10", "last-modified": f"Wed, 0{len(seen)} Jan 2025 00:00:00 GMT"},
+        )
+
+    cache = ResponseCache(clock=clock)
+    client = CursorClient(
+        "test_key", base_url="https://example.test", transport=httpx.MockTransport(handler), cache=cache
+    )
+
+    assert client.get_v0_me() == {"version": 1}
+    clock.now = 20.0
+    assert client.get_v0_me() == {"version": 2}
+    assert client.get_v0_me() == {"version": 2}  # Fresh again
+    assert seen == [None, "Wed, 01 Jan 2025 00:00:00 GMT"]
+
+    client.close()
+
+
+def test_client_keeps_caller_supplied_conditional_headers() -> None:
+    """Test that cached validators never override headers passed by the caller."""
+    clock = _Clock()
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("if-none-match"))
+        if len(seen) > 1:
+            return httpx.Response(304)
+        return httpx.Response(200, json={"ok": True}, headers={"cache-control": "max-age=1", "etag": '"server"'})
+
+    client = CursorClient(
+        "test_key",
+        base_url="https://example.test",
+        transport=httpx.MockTransport(handler),
+        cache=ResponseCache(clock=clock),
+    )
+
+    assert client.get_v0_me(headers={"If-None-Match": '"caller"'}) == {"ok": True}
+    clock.now = 5.0
+    assert client.get_v0_me(headers={"If-None-Match": '"caller"'}) == {"ok": True}
+    assert seen == ['"caller"', '"caller"']
+
+    client.close()
+
+
+def test_cache_revalidate_edge_cases() -> None:
+    """Test revalidation of missing entries and 304s that forbid storage."""
+    cache = ResponseCache(clock=_Clock())
+    assert cache.revalidate(("missing",)) is None
+    assert cache.conditional_headers(("missing",)) == {}
+
+    cache.set(("k",), "body", {"etag": '"v1"'})
+    entry = cache.revalidate(("k",), {"cache-control": "no-store"})
+    assert entry is not None
+    assert entry.body == "body"
+    assert len(cache) == 0
+
+
+def test_cache_keeps_entries_for_stale_if_error_window() -> None:
+    """Test that entries outlive their stale window while stale-if-error still applies."""
+    clock = _Clock()
+    cache = ResponseCache(ttl=10.0, stale_if_error=100.0, clock=clock)
+    cache.set(("default",), "a")
+    cache.set(("header",), "b", {"cache-control": "max-age=10, stale-if-error=20"})
+
+    clock.now = 15.0
+    assert cache.get(("default",)) is None
+    assert len(cache) == 2  # Expired for normal use, but kept for error fallback
+    default_entry = cache.get_stale_if_error(("default",))
+    assert default_entry is not None
+    assert default_entry.body == "a"
+
+    clock.now = 30.0
+    assert cache.get(("header",)) is None
+    assert cache.get_stale_if_error(("header",)) is None
+    assert cache.get_stale_if_error(("missing",)) is None
+    assert len(cache) == 1
+
+
+def test_client_serves_stale_body_on_network_error(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that a network failure falls back to a stale-if-error entry with a warning."""
+    clock = _Clock()
+    call_count = {"value": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        call_count["value"] += 1
+        if call_count["value"] > 1:
+            raise httpx.ConnectError("Connection failed", request=request)
+        return httpx.Response(200, json={"id": "me"}, headers={"cache-control": "max-age=10, stale-if-error=60"})
+
+    client = CursorClient(
+        "test_key",
+        base_url="https://example.test",
+        transport=httpx.MockTransport(handler),
+        cache=ResponseCache(clock=clock),
+    )
+
+    assert client.get_v0_me() == {"id": "me"}
+    clock.now = 30.0
+    with caplog.at_level(logging.WARNING, logger="cursor_sdk.client"):
+        assert client.get_v0_me() == {"id": "me"}
+    assert "Serving stale cached response for GET /v0/me" in caplog.text
+    assert call_count["value"] == 2
+
+    clock.now = 80.0
+    with pytest.raises(CursorNetworkError):
+        client.get_v0_me()
+
+    client.close()
@@ -0,0 +1,555 @@
+"""Tests for concurrent request helpers and the async client."""
+
+import asyncio
+import itertools
+import threading
+import time
+from concurrent.futures import CancelledError
+from typing import Any, Callable, Iterator
+
+import httpx
+import pytest
+
+from cursor_sdk import AsyncCursorClient, CursorClient, ResponseCache, TokenBucket, retry_with_backoff
+from cursor_sdk.errors import CursorAPIError, CursorAuthError, CursorNetworkError, CursorRateLimitError
+
+
+def test_gather_runs_calls_concurrently_in_order() -> None:
+    """Test that gather overlaps calls and returns results in call order."""
+    barrier = threading.Barrier(3, timeout=5.0)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        # Every request waits for the others, so this only completes if all three overlap
+        barrier.wait()
+        return httpx.Response(200, json={"path": request.url.path})
+
+    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+
+    results = client.gather(
+        lambda c: c.get_v0_me(),
+        lambda c: c.get_v0_models(),
+        lambda c: c.get_v0_repositories(),
+    )
+
+    assert results == [{"path": "/v0/me"}, {"path": "/v0/models"}, {"path": "/v0/repositories"}]
+    assert client.gather() == []
+
+    client.close()
+
+
+def test_gather_reraises_first_failure_after_all_finish() -> None:
+    """Test that gather waits for every call and re-raises the first error."""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        if request.url.path == "/v0/me":
+            return httpx.Response(400, json={"message": "Bad request"})
+        return httpx.Response(200, json={"ok": True})
+
+    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+
+    with pytest.raises(CursorAPIError):
+        client.gather(lambda c: c.get_v0_models(), lambda c: c.get_v0_me(), max_workers=1)
+    assert seen == ["/v0/models", "/v0/me"]
+
+    client.close()
+
+
+class _CountingDict(dict):
+    """In-flight map that counts lookups, so tests know when every caller has arrived."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lookups = 0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        self.lookups += 1
+        return super().get(key, default)
+
+
+class _Interrupted(BaseException):
+    """Stands in for KeyboardInterrupt or SystemExit in the leading thread."""
+
+
+def _coalescing_client(handler: Callable[[httpx.Request], httpx.Response], **kwargs: Any) -> CursorClient:
+    client = CursorClient(
+        "test_key",
+        base_url="https://example.test",
+        transport=httpx.MockTransport(handler),
+        coalesce_requests=True,
+        **kwargs,
+    )
+    client._inflight = _CountingDict()
+    return client
+
+
+def _run_concurrently(
+    client: CursorClient, call: Callable[[CursorClient], Any], count: int, release: threading.Event
+) -> tuple[list, list]:
+    inflight = client._inflight
+    assert isinstance(inflight, _CountingDict)
+    results: list = []
+    errors: list = []
+
+    def worker() -> None:
+        try:
+            results.append(call(client))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for t in threads:
+        t.start()
+    # Hold the single request open until every caller has joined it
+    deadline = time.monotonic() + 5.0
+    while inflight.lookups < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join(5.0)
+    return results, errors
+
+
+def test_coalesce_requests_shares_one_in_flight_get() -> None:
+    """Test that concurrent identical GETs collapse into one network call."""
+    seen = []
+    release = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        release.wait(5.0)
+        return httpx.Response(200, json={"id": "me"})
+
+    client = _coalescing_client(handler)
+    results, errors = _run_concurrently(client, lambda c: c.get_v0_me(), 10, release)
+
+    assert errors == []
+    assert seen == ["/v0/me"]
+    assert len(results) == 10
+    assert all(result is results[0] for result in results)
+    assert client._inflight == {}
+
+    # Once the first call has finished, the next identical GET goes to the network again
+    assert client.get_v0_me() == {"id": "me"}
+    assert len(seen) == 2
+    client.close()
+
+
+def test_coalesce_requests_shares_errors_and_skips_writes() -> None:
+    """Test that followers receive the leader's error and non-GETs are never coalesced."""
+    seen = []
+    release = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.method)
+        if request.method == "GET":
+            release.wait(5.0)
+            return httpx.Response(503, json={"message": "Unavailable"})
+        return httpx.Response(200, json={"ok": True})
+
+    client = _coalescing_client(handler)
+    results, errors = _run_concurrently(client, lambda c: c.get_teams_members(), 5, release)
+
+    assert results == []
+    assert len(errors) == 5
+    assert all(isinstance(e, CursorAPIError) and e.status_code == 503 for e in errors)
+    assert seen == ["GET"]
+    assert client._inflight == {}
+
+    client.post_teams_spend(json={})
+    client.post_teams_spend(json={})
+    assert seen == ["GET", "POST", "POST"]
+    client.close()
+
+
+@pytest.mark.parametrize("error_type", [_Interrupted, CancelledError])
+def test_coalesce_requests_interrupted_leader_releases_followers(error_type: type[BaseException]) -> None:
+    """Test that an interrupted leader's BaseException is not shared and followers send the GET themselves.
+
+    A CancelledError raised by the request itself is an ordinary Exception, so it is shared.
+    """
+    callers = 3
+    seen = []
+    joined = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.method)
+        if len(seen) == 1:
+            joined.wait(5.0)
+            raise error_type()
+        return httpx.Response(200, json={"ok": True})
+
+    client = _coalescing_client(handler)
+    inflight = client._inflight
+    assert isinstance(inflight, _CountingDict)
+    results: list = []
+    errors: list = []
+
+    def worker() -> None:
+        try:
+            results.append(client.get_v0_me())
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(callers)]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 5.0
+    while inflight.lookups < callers and time.monotonic() < deadline:
+        time.sleep(0.001)
+    joined.set()
+    for t in threads:
+        t.join(5.0)
+
+    if error_type is CancelledError:
+        assert results == []
+        assert len(errors) == callers and all(isinstance(e, CancelledError) for e in errors)
+        assert seen == ["GET"]
+    else:
+        assert len(errors) == 1 and isinstance(errors[0], _Interrupted)
+        assert results == [{"ok": True}] * (callers - 1)
+        assert 2 <= len(seen) <= callers
+    assert client._inflight == {}
+    client.close()
+
+
+def test_coalesce_requests_keys_on_params_and_works_with_cache() -> None:
+    """Test that different query parameters are not merged and cached GETs still coalesce."""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(str(request.url.params))
+        return httpx.Response(200, json={"params": str(request.url.params)})
+
+    client = _coalescing_client(handler, cache=ResponseCache(ttl=60.0))
+    assert client.get_v0_agents(params={"limit": "1"}) == {"params": "limit=1"}
+    assert client.get_v0_agents(params={"limit": "2"}) == {"params": "limit=2"}
+    assert client.get_v0_agents(params={"limit": "1"}) == {"params": "limit=1"}  # Cache hit
+    assert seen == ["limit=1", "limit=2"]
+    client.close()
+
+
+def _throttled_transport(callers: int, recovers: bool) -> tuple[httpx.MockTransport, Iterator[int]]:
+    """Answer the first ``callers`` requests with 429, then 200 if ``recovers`` (else 429 forever)."""
+    calls = itertools.count(1)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if next(calls) <= callers or not recovers:
+            return httpx.Response(429, json={"message": "Rate limited"})
+        return httpx.Response(200, json={"ok": True})
+
+    return httpx.MockTransport(handler), calls
+
+
+def _retry_waiters(func: Callable[..., Any]) -> int:
+    return sum(gate.waiters for gate in func._retry_gates.values())  # type: ignore[attr-defined]
+
+
+@pytest.mark.parametrize("recovers", [True, False])
+def test_coalesced_retries_share_one_retry_across_threads(recovers: bool) -> None:
+    """Test that threads throttled on one endpoint wait for a single retry and share its outcome."""
+    callers = 10
+    transport, calls = _throttled_transport(callers, recovers)
+    client = CursorClient("test_key", base_url="https://example.test", transport=transport)
+    bucket = TokenBucket(refill_per_sec=0.0, capacity=callers)
+
+    def sleep(delay: float) -> None:
+        # Hold the shared retry until every other caller is waiting for it
+        deadline = time.monotonic() + 5.0
+        while _retry_waiters(get_me) < callers - 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    @retry_with_backoff(max_retries=1, initial_delay=0.01, sleep=sleep, coalesce_retries=True, retry_bucket=bucket)
+    def get_me() -> Any:
+        return client.get_v0_me()
+
+    results: list = []
+    errors: list = []
+
+    def worker() -> None:
+        try:
+            results.append(get_me())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(callers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5.0)
+
+    assert next(calls) - 1 == callers + 1
+    if recovers:
+        assert errors == []
+        assert len(results) == callers
+        assert all(result is results[0] for result in results)
+    else:
+        assert results == []
+        assert len(errors) == callers
+        assert all(isinstance(e, CursorRateLimitError) for e in errors)
+    # Only the leader's retry spends a token; the shared success earns one credit
+    assert bucket.tokens == pytest.approx(callers - 1 + (0.1 if recovers else 0.0))
+    assert get_me._retry_gates == {}  # type: ignore[attr-defined]
+    client.close()
+
+
+def test_coalesced_retries_interrupted_leader_releases_waiters() -> None:
+    """Test that an interrupted leader's error is not shared and waiters retry by themselves."""
+    callers = 3
+    transport, calls = _throttled_transport(callers, recovers=True)
+    client = CursorClient("test_key", base_url="https://example.test", transport=transport)
+    leaders: list = []
+
+    def sleep(delay: float) -> None:
+        if leaders:
+            return  # Released waiters back off on their own
+        leaders.append(threading.current_thread())
+        deadline = time.monotonic() + 5.0
+        while _retry_waiters(get_me) < callers - 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        raise _Interrupted()
+
+    @retry_with_backoff(max_retries=1, initial_delay=0.01, sleep=sleep, coalesce_retries=True)
+    def get_me() -> Any:
+        return client.get_v0_me()
+
+    results: list = []
+    errors: list = []
+
+    def worker() -> None:
+        try:
+            results.append(get_me())
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(callers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5.0)
+
+    assert len(errors) == 1 and isinstance(errors[0], _Interrupted)
+    assert results == [{"ok": True}] * (callers - 1)
+    assert next(calls) - 1 == callers + (callers - 1)
+    assert get_me._retry_gates == {}  # type: ignore[attr-defined]
+    client.close()
+
+
+def test_coalesced_retries_cancelled_leader_does_not_cancel_waiters() -> None:
+    """Test that cancelling the leading task leaves the waiting tasks to retry by themselves."""
+    callers = 3
+    transport, calls = _throttled_transport(callers, recovers=True)
+    client = AsyncCursorClient("test_key", base_url="https://example.test", transport=transport)
+    leaders: list = []
+
+    async def sleep(delay: float) -> None:
+        if leaders:
+            return
+        leaders.append(asyncio.current_task())
+        await asyncio.Event().wait()  # Backs off until cancelled
+
+    @retry_with_backoff(max_retries=1, initial_delay=0.01, sleep=sleep, coalesce_retries=True)
+    async def get_me() -> Any:
+        return await client.get_v0_me()
+
+    async def run() -> list:
+        async with client:
+            tasks = [asyncio.create_task(get_me()) for _ in range(callers)]
+            while not leaders or _retry_waiters(get_me) < callers - 1:
+                await asyncio.sleep(0)
+            leaders[0].cancel()
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+    outcomes = asyncio.run(run())
+
+    cancelled = [outcome for outcome in outcomes if isinstance(outcome, asyncio.CancelledError)]
+    assert len(cancelled) == 1
+    assert [outcome for outcome in outcomes if outcome not in cancelled] == [{"ok": True}] * (callers - 1)
+    assert next(calls) - 1 == callers + (callers - 1)
+
+
+@pytest.mark.parametrize("recovers", [True, False])
+def test_coalesced_retries_single_request(recovers: bool) -> None:
+    """Test that 10 tasks throttled on one endpoint make 11 requests, not 20."""
+    callers = 10
+    transport, calls = _throttled_transport(callers, recovers)
+    client = AsyncCursorClient("test_key", base_url="https://example.test", transport=transport)
+    bucket = TokenBucket(refill_per_sec=0.0, capacity=callers)
+
+    async def sleep(delay: float) -> None:
+        while _retry_waiters(get_me) < callers - 1:
+            await asyncio.sleep(0)
+
+    @retry_with_backoff(max_retries=1, initial_delay=0.01, sleep=sleep, coalesce_retries=True, retry_bucket=bucket)
+    async def get_me() -> Any:
+        return await client.get_v0_me()
+
+    async def run() -> list:
+        async with client:
+            return await asyncio.gather(*(get_me() for _ in range(callers)), return_exceptions=True)
+
+    outcomes = asyncio.run(run())
+
+    assert next(calls) - 1 == callers + 1
+    if recovers:
+        assert outcomes == [{"ok": True}] * callers
+    else:
+        assert all(isinstance(outcome, CursorRateLimitError) for outcome in outcomes)
+    assert bucket.tokens == pytest.approx(callers - 1 + (0.1 if recovers else 0.0))
+
+
+def test_coalesced_retries_stay_on_their_event_loop() -> None:
+    """Test that coroutines on different event loops never wait on each other's shared retry."""
+    local = threading.local()
+    both_retrying = threading.Barrier(2, timeout=5.0)
+
+    async def sleep(delay: float) -> None:
+        # Each loop runs its own retry, so both back off at once; blocking is fine on a private loop
+        both_retrying.wait()
+
+    @retry_with_backoff(max_retries=1, initial_delay=0.01, sleep=sleep, coalesce_retries=True)
+    async def get_me() -> str:
+        if not getattr(local, "throttled", False):
+            local.throttled = True
+            raise CursorRateLimitError(429, "Rate limited", method="GET", url="/v0/me")
+        return "ok"
+
+    results: list = []
+    # Daemon threads, so a waiter stuck on another loop's event fails the test instead of hanging it
+    threads = [threading.Thread(target=lambda: results.append(asyncio.run(get_me())), daemon=True) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5.0)
+
+    assert not any(t.is_alive() for t in threads)
+    assert results == ["ok", "ok"]
+    assert get_me._retry_gates == {}  # type: ignore[attr-defined]
+
+
+def test_coalesced_retries_keep_calls_with_different_arguments_apart() -> None:
+    """Test that calls throttled together but made with different arguments each get their own result."""
+    local = threading.local()
+    both_retrying = threading.Barrier(2, timeout=5.0)
+
+    @retry_with_backoff(
+        max_retries=1, initial_delay=0.01, sleep=lambda delay: both_retrying.wait(), coalesce_retries=True
+    )
+    def page(cursor: str) -> str:
+        if not getattr(local, "throttled", False):
+            local.throttled = True
+            # The URL is the bare path, so both calls fail "against the same endpoint"
+            raise CursorRateLimitError(429, "Rate limited", method="GET", url="/v0/agents")
+        return f"page-{cursor}"
+
+    results: dict[str, str] = {}
+
+    def worker(cursor: str) -> None:
+        results[cursor] = page(cursor)
+
+    threads = [threading.Thread(target=worker, args=(cursor,), daemon=True) for cursor in ("A", "B")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5.0)
+
+    assert results == {"A": "page-A", "B": "page-B"}
+    assert page._retry_gates == {}  # type: ignore[attr-defined]
+
+
+def test_coalesce_key_decides_which_calls_share_a_retry() -> None:
+    """Test that calls with different arguments but equal coalesce_key results share one retry."""
+    callers = 3
+    transport, calls = _throttled_transport(callers, recovers=True)
+    client = CursorClient("test_key", base_url="https://example.test", transport=transport)
+
+    def sleep(delay: float) -> None:
+        deadline = time.monotonic() + 5.0
+        while _retry_waiters(get_me) < callers - 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    # The request id differs per call but does not change the request, so every call shares one key
+    @retry_with_backoff(
+        max_retries=1, initial_delay=0.01, sleep=sleep, coalesce_retries=True, coalesce_key=lambda request_id: None
+    )
+    def get_me(request_id: int) -> Any:
+        return client.get_v0_me()
+
+    results: list = []
+    threads = [threading.Thread(target=lambda i=i: results.append(get_me(i))) for i in range(callers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5.0)
+
+    assert results == [{"ok": True}] * callers
+    assert next(calls) - 1 == callers + 1
+    client.close()
+
+
+def test_coalesced_retries_with_unhashable_arguments_retry_alone() -> None:
+    """Test that a call whose arguments can't be compared retries without opening a gate."""
+    calls = itertools.count(1)
+    gates_seen: list = []
+
+    def sleep(delay: float) -> None:
+        gates_seen.append(dict(search._retry_gates))  # type: ignore[attr-defined]
+
+    @retry_with_backoff(max_retries=1, initial_delay=0.01, sleep=sleep, coalesce_retries=True)
+    def search(params: dict) -> str:
+        if next(calls) == 1:
+            raise CursorRateLimitError(429, "Rate limited", method="GET", url="/v0/agents")
+        return "ok"
+
+    assert search({"limit": 5}) == "ok"
+    assert gates_seen == [{}]
+
+
+def test_coalesced_retries_need_an_endpoint() -> None:
+    """Test that errors without a method and URL are retried per call rather than shared."""
+    calls = itertools.count(1)
+
+    @retry_with_backoff(max_retries=2, initial_delay=0.01, sleep=lambda delay: None, coalesce_retries=True)
+    def flaky() -> str:
+        if next(calls) < 3:
+            raise CursorNetworkError("boom", cause=OSError("reset"))
+        return "ok"
+
+    assert flaky() == "ok"
+    assert flaky._retry_gates == {}  # type: ignore[attr-defined]
+
+
+def test_async_client_gather_and_errors() -> None:
+    """Test the async client's gather, error mapping, and representation."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/teams/members":
+            return httpx.Response(401, json={"message": "Unauthorized"})
+        if request.url.path == "/v0/agents":
+            raise httpx.ConnectError("Connection failed", request=request)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    async def run() -> None:
+        async with AsyncCursorClient(
+            "test_key", base_url="https://example.test", transport=httpx.MockTransport(handler)
+        ) as client:
+            assert "AsyncCursorClient" in repr(client)
+            assert "test_key" not in str(client)
+
+            results = await client.gather(lambda c: c.get_v0_me(), lambda c: c.get_v0_models())
+            assert results == [{"path": "/v0/me"}, {"path": "/v0/models"}]
+
+            with pytest.raises(CursorAuthError):
+                await client.get_teams_members()
+            with pytest.raises(CursorNetworkError):
+                await client.get_v0_agents()
+
+    asyncio.run(run())
+
+
+def test_async_client_validates_like_sync_client() -> None:
+    """Test that the async client shares the sync client's argument validation."""
+    with pytest.raises(ValueError, match="api_key is required"):
+        AsyncCursorClient("")
+    with pytest.raises(ValueError, match="HTTP URLs are not allowed"):
+        AsyncCursorClient("test_key", base_url="http://example.test")
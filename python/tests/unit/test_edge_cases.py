@@ -4,12 +4,18 @@ import json
 import threading
 import time
 from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Callable
 
 import httpx
 import pytest
 
 from cursor_sdk import CursorClient
-from cursor_sdk.errors import CursorRateLimitError
+from cursor_sdk.errors import CursorAPIError, CursorRateLimitError
+
+
+def _mock_client(handler: Callable[[httpx.Request], httpx.Response]) -> CursorClient:
+    """Build a client whose requests are answered by ``handler``."""
+    return CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
 
 
 def test_large_response_handling() -> None:
@@ -21,7 +27,7 @@ def test_large_response_handling() -> None:
     def handler(request: httpx.Request) -> httpx.Response:
         return httpx.Response(200, content=large_json.encode("utf-8"), headers={"content-type": "application/json"})
 
-    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    client = _mock_client(handler)
     result = client.get_v0_agents()
 
     assert isinstance(result, dict)
@@ -34,7 +40,7 @@ def test_concurrent_requests() -> None:
     def handler(request: httpx.Request) -> httpx.Response:
         return httpx.Response(200, json={"ok": True})
 
-    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    client = _mock_client(handler)
 
     results = []
     errors = []
@@ -71,7 +77,7 @@ def test_rate_limit_error_with_retry_after() -> None:
             return httpx.Response(429, json={"message": "Rate limited"}, headers={"Retry-After": "1"})
         return httpx.Response(200, json={"ok": True})
 
-    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    client = _mock_client(handler)
 
     # First call should raise rate limit error
     with pytest.raises(CursorRateLimitError) as exc_info:
@@ -95,7 +101,7 @@ def test_network_error_retry_scenario() -> None:
             raise httpx.TimeoutException("Request timed out", request=request)
         return httpx.Response(200, json={"ok": True})
 
-    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    client = _mock_client(handler)
 
     from cursor_sdk.errors import CursorNetworkError
     # First call should raise network error
@@ -116,17 +122,20 @@ def test_empty_response_handling() -> None:
         (200, b""),   # Empty body
         (200, None), # None body
     ]
+    case: dict[str, Any] = {"status": 200, "content": None}
 
-    for status_code, content in test_cases:
-        def handler(request: httpx.Request) -> httpx.Response:
-            if content is None:
-                return httpx.Response(status_code)
-            return httpx.Response(status_code, content=content)
+    def handler(request: httpx.Request) -> httpx.Response:
+        if case["content"] is None:
+            return httpx.Response(case["status"])
+        return httpx.Response(case["status"], content=case["content"])
 
-        client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    # One client serves every case; only the handler's response changes
+    client = _mock_client(handler)
+    for status_code, content in test_cases:
+        case["status"], case["content"] = status_code, content
         result = client.get_v0_me()
         assert result is None
-        client.close()
+    client.close()
 
 
 def test_malformed_json_response() -> None:
@@ -134,7 +143,7 @@ def test_malformed_json_response() -> None:
     def handler(request: httpx.Request) -> httpx.Response:
         return httpx.Response(200, content=b"{invalid json", headers={"content-type": "application/json"})
 
-    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    client = _mock_client(handler)
     # Should fallback to text
     result = client.get_v0_me()
     assert isinstance(result, str)
@@ -142,6 +151,68 @@ def test_malformed_json_response() -> None:
     client.close()
 
 
+def test_custom_json_loader_decodes_success_and_error_bodies() -> None:
+    """Test that a json_loader hook receives raw body bytes for every JSON decode."""
+    loaded = []
+
+    def loader(content: bytes) -> Any:
+        loaded.append(content)
+        return json.loads(content)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/teams/members":
+            return httpx.Response(500, json={"message": "Server error"})
+        return httpx.Response(200, json={"ok": True})
+
+    client = CursorClient(
+        "test_key", base_url="https://example.test", transport=httpx.MockTransport(handler), json_loader=loader
+    )
+    assert client.get_v0_me() == {"ok": True}
+    with pytest.raises(CursorAPIError) as exc_info:
+        client.get_teams_members()
+    assert exc_info.value.message == "Server error"
+    assert all(isinstance(content, bytes) for content in loaded)
+    assert len(loaded) == 2
+    client.close()
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b'{"id": 123456789012345678901234567890}',
+        b'\xef\xbb\xbf{"id": 123456789012345678901234567890}',
+        '{"id": 123456789012345678901234567890}'.encode("utf-16"),
+    ],
+    ids=["big-int", "utf-8-bom", "utf-16"],
+)
+def test_default_json_loader_matches_response_json(content: bytes) -> None:
+    """Test that the default decoding keeps big ints exact and detects BOMs like Response.json()."""
+    client = _mock_client(lambda request: httpx.Response(200, content=content))
+    result = client.get_v0_me()
+    assert result == httpx.Response(200, content=content).json()
+    assert result == {"id": 123456789012345678901234567890}
+    client.close()
+
+
+def test_orjson_loader_is_opt_in() -> None:
+    """Test that orjson is only used when passed explicitly, and its errors still fall back to text."""
+    orjson = pytest.importorskip("orjson")
+
+    default_client = _mock_client(lambda request: httpx.Response(200))
+    assert default_client._json_loader is json.loads
+    default_client.close()
+
+    client = CursorClient(
+        "test_key",
+        base_url="https://example.test",
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"{invalid json")),
+        json_loader=orjson.loads,
+    )
+    # orjson's decode errors are ValueErrors, so malformed bodies still fall back to text
+    assert client.get_v0_me() == "{invalid json"
+    client.close()
+
+
 def test_very_long_path_parameter() -> None:
     """Test handling of very long path parameters."""
     long_id = "a" * 1000  # Very long ID
@@ -151,7 +222,7 @@ def test_very_long_path_parameter() -> None:
         assert long_id in request.url.path or "%61" in request.url.path
         return httpx.Response(200, json={"ok": True})
 
-    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    client = _mock_client(handler)
     result = client.get_v0_agents_id(long_id)
     assert result == {"ok": True}
     client.close()
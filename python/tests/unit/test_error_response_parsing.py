@@ -1,10 +1,16 @@
 """Tests for error response parsing."""
 
+import copy
+import pickle
+from contextlib import contextmanager
+from dataclasses import FrozenInstanceError
+from typing import Callable, Iterator
+
 import httpx
 import pytest
 
 from cursor_sdk import CursorClient
-from cursor_sdk.errors import CursorAPIError, CursorAuthError
+from cursor_sdk.errors import CursorAPIError, CursorAuthError, CursorRateLimitError
 
 
 def test_error_with_message_field() -> None:
@@ -115,3 +121,57 @@ def test_auth_error_message_extraction() -> None:
     client.close()
 
 
+def test_api_error_fields_live_in_slots() -> None:
+    """Test that error fields are slot-backed rather than stored in the instance dict."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(403, json={"message": "Forbidden"})
+
+    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    with pytest.raises(CursorAuthError) as exc:
+        client.get_v0_me()
+    assert "status_code" in getattr(CursorAPIError, "__slots__")
+    assert exc.value.__dict__ == {}
+    assert exc.value.status_code == 403
+    client.close()
+
+
+def test_api_error_fields_are_frozen_but_exception_state_is_writable() -> None:
+    """Test that fields stay immutable while tracebacks can still be attached."""
+    exc = CursorRateLimitError(429, "Slow down")
+    with pytest.raises(FrozenInstanceError):
+        exc.status_code = 500  # type: ignore[misc]
+    with pytest.raises(FrozenInstanceError):
+        del exc.message
+
+    exc.__traceback__ = None
+    setattr(exc, "attempts", 2)
+    delattr(exc, "attempts")
+    assert exc.status_code == 429
+
+    @contextmanager
+    def passthrough() -> Iterator[None]:
+        yield
+
+    with pytest.raises(CursorRateLimitError):
+        with passthrough():
+            raise exc
+
+
+def _pickle_round_trip(exc: CursorAPIError) -> CursorAPIError:
+    return pickle.loads(pickle.dumps(exc))  # type: ignore[no-any-return]
+
+
+@pytest.mark.parametrize("clone", [_pickle_round_trip, copy.copy, copy.deepcopy], ids=["pickle", "copy", "deepcopy"])
+def test_api_error_survives_pickle_and_copy(clone: Callable[[CursorAPIError], CursorAPIError]) -> None:
+    """Test that pickling and copying keep every field and any extra attributes."""
+    exc = CursorRateLimitError(
+        429, "Slow down", body={"message": "Slow down"}, headers={"Retry-After": "1"}, method="GET", url="/v0/me"
+    )
+    setattr(exc, "attempts", 2)
+
+    restored = clone(exc)
+
+    assert type(restored) is CursorRateLimitError
+    assert restored == exc
+    assert (restored.body, restored.headers, restored.method, restored.url) == (exc.body, exc.headers, "GET", "/v0/me")
+    assert getattr(restored, "attempts") == 2
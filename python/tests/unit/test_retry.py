@@ -1,232 +1,789 @@
 """Tests for retry logic."""
 
-import time
-from unittest.mock import Mock, patch
+import asyncio
+import builtins
+import inspect
+import itertools
+import random
+import statistics
+import threading
+from typing import Any, Callable, Optional
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
 
 import httpx
 import pytest
 
-from cursor_sdk import CursorClient, retry_with_backoff
-from cursor_sdk.errors import CursorNetworkError, CursorRateLimitError
+from cursor_sdk import AsyncCursorClient, CursorClient, RetryEvent, TokenBucket, retry_with_backoff
+from cursor_sdk.errors import CursorAPIError, CursorNetworkError, CursorRateLimitError
+from cursor_sdk import retry as retry_module
+from cursor_sdk.retry import _backoff_delays, _parse_retry_after
 
 
-def test_retry_on_network_error() -> None:
-    """Test that retry works on network errors."""
-    call_count = {"value": 0}
+class FakeClock:
+    """Stand-in for time.sleep and time.monotonic that records sleeps and returns at once."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fake_clock() -> FakeClock:
+    return FakeClock()
+
+
+UseHandler = Callable[[Callable[[httpx.Request], httpx.Response]], None]
+
+
+def _connect_error(request: httpx.Request) -> httpx.Response:
+    raise httpx.ConnectError("Connection failed", request=request)
+
+
+def _ok(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"ok": True})
+
+
+def _bad_request(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(400, json={"message": "Bad request"})
+
+
+def _rate_limited(retry_after: Optional[str] = None) -> Callable[[httpx.Request], httpx.Response]:
+    headers = {} if retry_after is None else {"Retry-After": retry_after}
+    return lambda request: httpx.Response(429, json={"message": "Rate limited"}, headers=headers)
+
+
+# Each scenario answers successive requests from `sequence`; delays use initial_delay=0.01 without jitter
+SCENARIOS = [
+    pytest.param(
+        [_connect_error, _connect_error, _ok], 3, [0.01, 0.02], ["network"] * 2, None, id="network-error-retry"
+    ),
+    pytest.param(
+        [_connect_error] * 4, 4, [0.01, 0.02, 0.04], ["network"] * 3, CursorNetworkError, id="network-error-exhausted"
+    ),
+    pytest.param([_rate_limited(), _ok], 2, [0.01], ["rate_limit"], None, id="rate-limit-backoff"),
+    pytest.param([_rate_limited("0.1"), _ok], 2, [0.1], ["retry_after"], None, id="retry-after-header"),
+    # An unparseable Retry-After falls back to exponential backoff
+    pytest.param([_rate_limited("invalid"), _ok], 2, [0.01], ["rate_limit"], None, id="invalid-retry-after"),
+    pytest.param([_bad_request], 1, [], [], CursorAPIError, id="no-retry-400"),
+]
+
+
+@pytest.mark.parametrize(
+    "sequence, expected_calls, expected_sleeps, expected_reasons, expected_exception", SCENARIOS
+)
+def test_retry_scenarios(
+    mock_client: CursorClient,
+    use_handler: UseHandler,
+    fake_clock: FakeClock,
+    sequence: list[Callable[[httpx.Request], httpx.Response]],
+    expected_calls: int,
+    expected_sleeps: list[float],
+    expected_reasons: list[str],
+    expected_exception: Optional[type[Exception]],
+) -> None:
+    """Test which failures are retried, how often, how long each backoff waits, and why."""
+    responses = iter(sequence)
+    calls = itertools.count(1)
+    events: list[RetryEvent] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        next(calls)
+        return next(responses)(request)
+
+    use_handler(handler)
+
+    @retry_with_backoff(
+        max_retries=3,
+        initial_delay=0.01,
+        jitter=0.0,
+        sleep=fake_clock.sleep,
+        clock=fake_clock.time,
+        on_retry=events.append,
+    )
+    def make_request() -> Any:
+        return mock_client.get_v0_me()
+
+    if expected_exception is None:
+        assert make_request() == {"ok": True}
+    else:
+        with pytest.raises(expected_exception):
+            make_request()
+    assert next(calls) - 1 == expected_calls
+    assert fake_clock.sleeps == expected_sleeps
+    assert [event.reason for event in events] == expected_reasons
+    assert [event.delay for event in events] == expected_sleeps
+    assert [event.attempt for event in events] == list(range(1, len(events) + 1))
+
+
+def test_retry_exponential_backoff(mock_client: CursorClient, use_handler: UseHandler, fake_clock: FakeClock) -> None:
+    """Test that retry uses exponential backoff."""
+    calls = itertools.count(1)
 
     def handler(request: httpx.Request) -> httpx.Response:
-        call_count["value"] += 1
-        if call_count["value"] < 3:
+        n = next(calls)
+        if n < 3:
             raise httpx.ConnectError("Connection failed", request=request)
         return httpx.Response(200, json={"ok": True})
 
-    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    use_handler(handler)
 
-    @retry_with_backoff(max_retries=3, initial_delay=0.01)
-    def make_request() -> dict:
-        return client.get_v0_me()
+    @retry_with_backoff(
+        max_retries=3, initial_delay=0.1, exponential_base=2.0, jitter=0.0, sleep=fake_clock.sleep, clock=fake_clock.time
+    )
+    def make_request() -> Any:
+        return mock_client.get_v0_me()
 
+    assert make_request._schedule == (0.1, 0.2, 0.4)  # type: ignore[attr-defined]
     result = make_request()
     assert result == {"ok": True}
-    assert call_count["value"] == 3
+    assert fake_clock.sleeps == [0.1, 0.2]
 
-    client.close()
 
+def test_retry_skips_post_without_idempotency_key(
+    mock_client: CursorClient, use_handler: UseHandler, fake_clock: FakeClock
+) -> None:
+    """Test that a POST failing with a network error is not resent without an Idempotency-Key."""
+    calls = itertools.count(1)
 
-def test_retry_exhausts_after_max_retries() -> None:
-    """Test that retry raises after max retries."""
     def handler(request: httpx.Request) -> httpx.Response:
+        next(calls)
         raise httpx.ConnectError("Connection failed", request=request)
 
-    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    use_handler(handler)
 
-    @retry_with_backoff(max_retries=2, initial_delay=0.01)
-    def make_request() -> dict:
-        return client.get_v0_me()
+    @retry_with_backoff(max_retries=3, initial_delay=0.01, sleep=fake_clock.sleep, clock=fake_clock.time)
+    def make_request() -> Any:
+        return mock_client.post_teams_groups(json={"name": "eng"})
 
-    with pytest.raises(CursorNetworkError):
+    with pytest.raises(CursorNetworkError) as exc_info:
         make_request()
 
-    client.close()
+    assert exc_info.value.idempotency_key is None
+    assert next(calls) - 1 == 1
+    assert fake_clock.sleeps == []
 
 
-def test_retry_exponential_backoff() -> None:
-    """Test that retry uses exponential backoff."""
-    call_times = []
+def test_retry_retries_post_with_idempotency_key(
+    mock_client: CursorClient, use_handler: UseHandler, fake_clock: FakeClock
+) -> None:
+    """Test that a POST carrying an Idempotency-Key is retried like an idempotent request."""
+    calls = itertools.count(1)
+    keys = []
 
     def handler(request: httpx.Request) -> httpx.Response:
-        call_times.append(time.time())
-        if len(call_times) < 3:
+        keys.append(request.headers.get("Idempotency-Key"))
+        if next(calls) < 3:
             raise httpx.ConnectError("Connection failed", request=request)
         return httpx.Response(200, json={"ok": True})
 
-    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    use_handler(handler)
 
-    @retry_with_backoff(max_retries=3, initial_delay=0.1, exponential_base=2.0)
-    def make_request() -> dict:
-        return client.get_v0_me()
+    @retry_with_backoff(max_retries=3, initial_delay=0.01, sleep=fake_clock.sleep, clock=fake_clock.time)
+    def make_request() -> Any:
+        return mock_client.post_teams_groups(json={"name": "eng"}, headers={"idempotency-key": "create-eng"})
+
+    assert make_request() == {"ok": True}
+    assert keys == ["create-eng"] * 3
+    assert len(fake_clock.sleeps) == 2
+
+
+def test_retry_max_delay_cap(mock_client: CursorClient, use_handler: UseHandler, fake_clock: FakeClock) -> None:
+    """Test that retry respects max_delay cap."""
+    calls = itertools.count(1)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        n = next(calls)
+        if n < 3:
+            raise httpx.ConnectError("Connection failed", request=request)
+        return httpx.Response(200, json={"ok": True})
+
+    use_handler(handler)
+
+    # Max delay should cap the huge initial_delay
+    @retry_with_backoff(
+        max_retries=3, initial_delay=100.0, max_delay=0.1, jitter=0.0, sleep=fake_clock.sleep, clock=fake_clock.time
+    )
+    def make_request() -> Any:
+        return mock_client.get_v0_me()
 
     result = make_request()
+
     assert result == {"ok": True}
+    assert fake_clock.sleeps == [0.1, 0.1]
 
-    # Verify delays increased exponentially (approximately)
-    if len(call_times) >= 3:
-        delay1 = call_times[1] - call_times[0]
-        delay2 = call_times[2] - call_times[1]
-        # Allow some tolerance for timing
-        assert delay2 > delay1 * 1.5  # Should be roughly double
 
-    client.close()
+def test_retry_jitter_stays_within_bounds(
+    mock_client: CursorClient, use_handler: UseHandler, fake_clock: FakeClock
+) -> None:
+    """Test that jittered delays stay within [delay * (1 - jitter), delay]."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("Connection failed", request=request)
 
+    use_handler(handler)
 
-def test_retry_on_rate_limit_error() -> None:
-    """Test that retry works on rate limit errors."""
-    call_count = {"value": 0}
+    @retry_with_backoff(max_retries=3, initial_delay=1.0, jitter=0.5, sleep=fake_clock.sleep, clock=fake_clock.time)
+    def make_request() -> Any:
+        return mock_client.get_v0_me()
+
+    with pytest.raises(CursorNetworkError):
+        make_request()
+
+    delays = fake_clock.sleeps
+    assert len(delays) == 3
+    for attempt, delay in enumerate(delays):
+        upper = 1.0 * (2.0 ** attempt)
+        assert upper * 0.5 <= delay <= upper
+
+
+def test_retry_jitter_bounded() -> None:
+    """Test that full jitter spreads delays over [0, delay] and a seeded rng is reproducible."""
+    def fail() -> None:
+        raise CursorNetworkError("boom", cause=OSError("reset"))
+
+    def collect_sleeps(seed: int) -> list[float]:
+        clock = FakeClock()
+        decorated = retry_with_backoff(
+            max_retries=1, initial_delay=1.0, jitter=1.0, rng=random.Random(seed), sleep=clock.sleep, clock=clock.time
+        )(fail)
+        for _ in range(200):
+            with pytest.raises(CursorNetworkError):
+                decorated()
+        return clock.sleeps
+
+    sleeps = collect_sleeps(0)
+    assert len(sleeps) == 200
+    assert all(0.0 <= s <= 1.0 for s in sleeps)
+    assert statistics.stdev(sleeps) > 0
+    assert collect_sleeps(0) == sleeps
+    assert collect_sleeps(1) != sleeps
+
+
+def test_retry_invalid_jitter() -> None:
+    """Test that jitter outside [0, 1] is rejected."""
+    with pytest.raises(ValueError, match="jitter"):
+        retry_with_backoff(jitter=1.5)
+    with pytest.raises(ValueError, match="jitter"):
+        retry_with_backoff(jitter=-0.1)
+
+
+@pytest.mark.parametrize("usegmt", [True, False])
+def test_retry_after_http_date(
+    mock_client: CursorClient, use_handler: UseHandler, usegmt: bool, fake_clock: FakeClock
+) -> None:
+    """Test that an HTTP-date Retry-After is converted to a delay."""
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    retry_after = format_datetime(retry_at, usegmt=usegmt)
+    if not usegmt:
+        # "-0000" marks the date as UTC without a timezone, yielding a naive datetime
+        retry_after = retry_after.replace("+0000", "-0000")
+    calls = itertools.count(1)
 
     def handler(request: httpx.Request) -> httpx.Response:
-        call_count["value"] += 1
-        if call_count["value"] < 2:
-            return httpx.Response(429, json={"message": "Rate limited"})
+        n = next(calls)
+        if n < 2:
+            return httpx.Response(429, json={"message": "Rate limited"}, headers={"Retry-After": retry_after})
         return httpx.Response(200, json={"ok": True})
 
-    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    use_handler(handler)
 
-    @retry_with_backoff(max_retries=3, initial_delay=0.01)
-    def make_request() -> dict:
-        return client.get_v0_me()
+    @retry_with_backoff(max_retries=3, initial_delay=0.01, sleep=fake_clock.sleep, clock=fake_clock.time)
+    def make_request() -> Any:
+        return mock_client.get_v0_me()
 
-    result = make_request()
-    assert result == {"ok": True}
-    assert call_count["value"] == 2
+    assert make_request() == {"ok": True}
 
-    client.close()
+    (delay,) = fake_clock.sleeps
+    # format_datetime drops microseconds, so allow for truncation and test runtime
+    assert 28.0 < delay <= 30.0
 
 
-def test_retry_respects_retry_after_header() -> None:
-    """Test that retry respects Retry-After header for rate limits."""
-    call_count = {"value": 0}
+@pytest.mark.parametrize(
+    "retry_after",
+    [
+        "-5",
+        "nan",
+        "inf",
+        "1e400",
+        pytest.param("9" * 5000, id="too-many-digits"),
+        "Fri, 31 Dec 1999 23:59:59 GMT",
+    ],
+)
+def test_retry_after_unusable_values_fall_back_to_backoff(
+    mock_client: CursorClient, use_handler: UseHandler, retry_after: str, fake_clock: FakeClock
+) -> None:
+    """Test that negative, NaN, infinite, overlong, and past Retry-After values use exponential backoff."""
+    calls = itertools.count(1)
 
     def handler(request: httpx.Request) -> httpx.Response:
-        call_count["value"] += 1
-        if call_count["value"] < 2:
-            return httpx.Response(429, json={"message": "Rate limited"}, headers={"Retry-After": "0.1"})
+        n = next(calls)
+        if n < 2:
+            return httpx.Response(429, json={"message": "Rate limited"}, headers={"Retry-After": retry_after})
         return httpx.Response(200, json={"ok": True})
 
-    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    use_handler(handler)
 
-    start_time = time.time()
+    @retry_with_backoff(max_retries=3, initial_delay=0.25, jitter=0.0, sleep=fake_clock.sleep, clock=fake_clock.time)
+    def make_request() -> Any:
+        return mock_client.get_v0_me()
 
-    @retry_with_backoff(max_retries=3, initial_delay=0.5)  # Should use Retry-After instead
-    def make_request() -> dict:
-        return client.get_v0_me()
+    assert make_request() == {"ok": True}
 
-    result = make_request()
-    elapsed = time.time() - start_time
+    assert fake_clock.sleeps == [0.25]
 
-    assert result == {"ok": True}
-    # Should have waited approximately 0.1 seconds (Retry-After value)
-    # Note: initial_delay might be used on first retry, so allow wider range
-    assert 0.05 < elapsed < 0.6  # Allow tolerance for timing variations
 
-    client.close()
+def test_retry_after_isdigit_fastpath(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that whole-second Retry-After values are parsed without float() parsing the string."""
+    def no_float_parse(value: object) -> float:
+        if isinstance(value, str):
+            raise AssertionError("float() should not parse whole seconds")
+        return builtins.float(value)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(retry_module, "float", no_float_parse, raising=False)
+    assert _parse_retry_after("5") == 5.0
+    assert type(_parse_retry_after("120")) is float
+    with pytest.raises(AssertionError):
+        _parse_retry_after("0.5")
 
 
-def test_retry_does_not_retry_other_errors() -> None:
-    """Test that retry doesn't retry non-retryable errors."""
-    call_count = {"value": 0}
+def test_retry_deadline_shortens_delays_and_stops(
+    mock_client: CursorClient, use_handler: UseHandler, fake_clock: FakeClock
+) -> None:
+    """Test that the deadline clamps backoff delays and stops retrying once spent."""
+    calls = itertools.count(1)
 
     def handler(request: httpx.Request) -> httpx.Response:
-        call_count["value"] += 1
-        return httpx.Response(400, json={"message": "Bad request"})
+        next(calls)
+        raise httpx.ConnectError("Connection failed", request=request)
 
-    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    use_handler(handler)
 
-    @retry_with_backoff(max_retries=3, initial_delay=0.01)
-    def make_request() -> dict:
-        return client.get_v0_me()
+    @retry_with_backoff(
+        max_retries=5, initial_delay=1.0, jitter=0.0, deadline=2.5, sleep=fake_clock.sleep, clock=fake_clock.time
+    )
+    def make_request() -> Any:
+        return mock_client.get_v0_me()
 
-    from cursor_sdk.errors import CursorAPIError
-    with pytest.raises(CursorAPIError):
+    with pytest.raises(CursorNetworkError):
         make_request()
 
-    # Should only be called once (no retries for 400 errors)
-    assert call_count["value"] == 1
+    # 1.0s fits, the 2.0s backoff is clamped to the 1.5s remaining, then the budget is spent
+    assert fake_clock.sleeps == [1.0, 1.5]
+    assert fake_clock.now == 2.5
+    assert next(calls) - 1 == 3
 
-    client.close()
 
+def test_retry_cancel_event_interrupts_backoff(mock_client: CursorClient, use_handler: UseHandler) -> None:
+    """Test that setting cancel_event aborts a pending backoff immediately."""
+    calls = itertools.count(1)
+    cancel_event = threading.Event()
 
-def test_retry_max_delay_cap() -> None:
-    """Test that retry respects max_delay cap."""
-    call_times = []
+    def handler(request: httpx.Request) -> httpx.Response:
+        next(calls)
+        # Shutdown is requested while the first attempt is in flight
+        cancel_event.set()
+        raise httpx.ConnectError("Connection failed", request=request)
+
+    use_handler(handler)
+
+    @retry_with_backoff(max_retries=3, initial_delay=60.0, cancel_event=cancel_event)
+    def make_request() -> Any:
+        return mock_client.get_v0_me()
+
+    with pytest.raises(CursorNetworkError):
+        make_request()
+
+    # The 30-60s backoff was abandoned instead of retried
+    assert next(calls) - 1 == 1
+
+
+def test_retry_cancel_event_unset_waits_and_retries(mock_client: CursorClient, use_handler: UseHandler) -> None:
+    """Test that an unset cancel_event behaves like a normal sleep."""
+    calls = itertools.count(1)
 
     def handler(request: httpx.Request) -> httpx.Response:
-        call_times.append(time.time())
-        if len(call_times) < 3:
+        n = next(calls)
+        if n < 2:
             raise httpx.ConnectError("Connection failed", request=request)
         return httpx.Response(200, json={"ok": True})
 
-    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    use_handler(handler)
+
+    @retry_with_backoff(max_retries=3, initial_delay=0.01, cancel_event=threading.Event())
+    def make_request() -> Any:
+        return mock_client.get_v0_me()
+
+    assert make_request() == {"ok": True}
+    assert next(calls) - 1 == 2
+
+
+def test_retry_schedule_is_shared_per_settings() -> None:
+    """Test that decorators built with identical backoff settings share one precomputed schedule."""
+    def first() -> None: ...
+    def second() -> None: ...
+
+    shared = retry_with_backoff(max_retries=2, initial_delay=0.5)(first)._schedule  # type: ignore[attr-defined]
+    assert retry_with_backoff(max_retries=2, initial_delay=0.5)(second)._schedule is shared  # type: ignore[attr-defined]
+    assert retry_with_backoff(max_retries=3)(first)._schedule is not shared  # type: ignore[attr-defined]
+
+
+def test_retry_accepts_unhashable_collections(fake_clock: FakeClock) -> None:
+    """Test that retry_on and idempotent_methods may be given as a list and a set."""
+    methods = iter(["GET", "PUT"])
+
+    @retry_with_backoff(
+        retry_on=[CursorNetworkError],
+        idempotent_methods={"get"},
+        initial_delay=0.01,
+        sleep=fake_clock.sleep,
+        clock=fake_clock.time,
+    )
+    def flaky() -> None:
+        raise CursorNetworkError("boom", cause=OSError("reset"), method=next(methods), url="/v0/me")
+
+    # The GET failure is retried; the PUT failure is not, since only GET is idempotent here
+    with pytest.raises(CursorNetworkError) as exc_info:
+        flaky()
+    assert exc_info.value.method == "PUT"
+    assert len(fake_clock.sleeps) == 1
+
+
+@pytest.mark.parametrize(
+    ("options", "expected_sleeps"),
+    [
+        ({}, [120.0]),
+        ({"respect_retry_after_over_cap": False}, [60.0]),
+        ({"retry_after_cap": 300.0}, [120.0]),
+    ],
+)
+def test_retry_after_longer_than_max_delay(
+    mock_client: CursorClient, use_handler: UseHandler, options: dict, expected_sleeps: list, fake_clock: FakeClock
+) -> None:
+    """Test that a Retry-After above max_delay is honored unless clamping is requested."""
+    calls = itertools.count(1)
 
-    @retry_with_backoff(max_retries=3, initial_delay=100.0, max_delay=0.1)  # Max delay should cap it
-    def make_request() -> dict:
-        return client.get_v0_me()
+    def handler(request: httpx.Request) -> httpx.Response:
+        n = next(calls)
+        if n < 2:
+            return httpx.Response(429, json={"message": "Rate limited"}, headers={"Retry-After": "120"})
+        return httpx.Response(200, json={"ok": True})
 
-    start_time = time.time()
-    result = make_request()
-    elapsed = time.time() - start_time
+    use_handler(handler)
 
-    assert result == {"ok": True}
-    # Should be capped at max_delay, not use the huge initial_delay
-    assert elapsed < 0.5  # Much less than 100 seconds
+    @retry_with_backoff(max_retries=3, max_delay=60.0, sleep=fake_clock.sleep, clock=fake_clock.time, **options)
+    def make_request() -> Any:
+        return mock_client.get_v0_me()
 
-    client.close()
+    assert make_request() == {"ok": True}
 
+    assert fake_clock.sleeps == expected_sleeps
 
-def test_retry_invalid_retry_after_header() -> None:
-    """Test that retry handles invalid Retry-After header gracefully."""
-    call_count = {"value": 0}
+
+@pytest.mark.parametrize("retry_after", ["99999999999", "Fri, 31 Dec 9999 23:59:59 GMT"])
+def test_retry_after_honored_delay_is_capped(
+    mock_client: CursorClient, use_handler: UseHandler, retry_after: str, fake_clock: FakeClock
+) -> None:
+    """Test that an enormous Retry-After is honored for at most a day instead of overflowing sleep."""
+    calls = itertools.count(1)
 
     def handler(request: httpx.Request) -> httpx.Response:
-        call_count["value"] += 1
-        if call_count["value"] < 2:
-            # Invalid Retry-After value (not a number)
-            return httpx.Response(429, json={"message": "Rate limited"}, headers={"Retry-After": "invalid"})
+        if next(calls) < 2:
+            return httpx.Response(429, json={"message": "Rate limited"}, headers={"Retry-After": retry_after})
         return httpx.Response(200, json={"ok": True})
 
-    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    use_handler(handler)
 
-    @retry_with_backoff(max_retries=3, initial_delay=0.01)
-    def make_request() -> dict:
-        return client.get_v0_me()
+    @retry_with_backoff(max_retries=3, sleep=fake_clock.sleep, clock=fake_clock.time)
+    def make_request() -> Any:
+        return mock_client.get_v0_me()
 
-    # Should fallback to exponential backoff when Retry-After is invalid
-    result = make_request()
-    assert result == {"ok": True}
-    assert call_count["value"] == 2
+    assert make_request() == {"ok": True}
+    assert fake_clock.sleeps == [86400.0]
+
+
+def test_retry_after_over_cap_fails_fast(
+    mock_client: CursorClient, use_handler: UseHandler, fake_clock: FakeClock
+) -> None:
+    """Test that a Retry-After above retry_after_cap raises without sleeping."""
+    calls = itertools.count(1)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        next(calls)
+        return httpx.Response(429, json={"message": "Rate limited"}, headers={"Retry-After": "3600"})
+
+    use_handler(handler)
+
+    @retry_with_backoff(max_retries=3, retry_after_cap=30.0, sleep=fake_clock.sleep, clock=fake_clock.time)
+    def make_request() -> Any:
+        return mock_client.get_v0_me()
+
+    with pytest.raises(CursorRateLimitError):
+        make_request()
+
+    assert fake_clock.sleeps == []
+    assert next(calls) - 1 == 1
+
+
+def test_retry_on_matches_subclasses(fake_clock: FakeClock) -> None:
+    """Test that retry_on still matches subclasses of the listed exception types."""
+    class CustomNetworkError(CursorNetworkError):
+        pass
+
+    attempts: list[None] = []
+
+    @retry_with_backoff(max_retries=2, initial_delay=0.0, sleep=fake_clock.sleep, clock=fake_clock.time)
+    def flaky() -> str:
+        attempts.append(None)
+        if len(attempts) < 2:
+            raise CustomNetworkError("boom", cause=OSError("reset"))
+        return "ok"
+
+    assert flaky() == "ok"
+    assert len(attempts) == 2
+
+
+@pytest.mark.parametrize(
+    ("max_retries", "initial_delay", "max_delay", "exponential_base", "expected"),
+    [
+        (5, 0.1, 1.0, 2.0, (0.1, 0.2, 0.4, 0.8, 1.0)),
+        (4, 1.0, 20.0, 3.0, (1.0, 3.0, 9.0, 20.0)),
+        (3, 8.0, 60.0, 0.5, (8.0, 4.0, 2.0)),
+        (0, 1.0, 60.0, 2.0, ()),
+    ],
+)
+def test_backoff_delays_table(
+    max_retries: int, initial_delay: float, max_delay: float, exponential_base: float, expected: tuple
+) -> None:
+    """Test the precomputed backoff schedule for base 2 (ldexp) and other bases."""
+    assert _backoff_delays(max_retries, initial_delay, max_delay, exponential_base) == pytest.approx(expected)
+
+
+def test_backoff_delays_large_max_retries_do_not_overflow() -> None:
+    """Test that exponents past the float range are never computed once the cap is reached."""
+    delays = _backoff_delays(5000, 1.0, 60.0, 2.0)
+    assert len(delays) == 5000
+    assert delays[-1] == 60.0
+    assert _backoff_delays(5000, 1.0, 60.0, 10.0)[-1] == 60.0
+
+
+def test_adaptive_retry_fails_fast_when_bucket_empty(
+    mock_client: CursorClient, use_handler: UseHandler, fake_clock: FakeClock
+) -> None:
+    """Test that once a shared retry bucket is drained, failures are raised without retrying."""
+    calls = itertools.count(1)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        next(calls)
+        raise httpx.ConnectError("Connection failed", request=request)
+
+    use_handler(handler)
+    bucket = TokenBucket(refill_per_sec=0.5, capacity=10, clock=fake_clock.time)
+
+    @retry_with_backoff(
+        max_retries=2, initial_delay=0.01, sleep=fake_clock.sleep, clock=fake_clock.time, retry_bucket=bucket
+    )
+    def make_request() -> Any:
+        return mock_client.get_v0_me()
 
-    client.close()
+    for _ in range(20):
+        with pytest.raises(CursorNetworkError):
+            make_request()
 
+    # The first 5 requests spend the 10 tokens on retries; the other 15 are sent only once
+    assert len(fake_clock.sleeps) == 10
+    assert next(calls) - 1 == 5 * 3 + 15
+    assert bucket.tokens < 1
 
-def test_retry_rate_limit_without_retry_after() -> None:
-    """Test that retry uses exponential backoff when Retry-After is missing."""
-    call_count = {"value": 0}
+
+def test_token_bucket_refills_and_credits() -> None:
+    """Test the bucket's refill over time, success credits, and capacity limit."""
+    clock = FakeClock()
+    bucket = TokenBucket(refill_per_sec=0.5, capacity=2, clock=clock.time)
+
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    clock.sleep(2.0)
+    assert bucket.tokens == 1.0
+    for _ in range(5):
+        bucket.credit()
+    assert bucket.tokens == pytest.approx(1.5)
+
+    clock.sleep(10.0)
+    assert bucket.tokens == 2.0
+
+
+@pytest.mark.parametrize("refill_per_sec, capacity", [(-1.0, 10), (0.5, 0)])
+def test_token_bucket_invalid_arguments(refill_per_sec: float, capacity: float) -> None:
+    """Test that a negative refill rate or a non-positive capacity is rejected."""
+    with pytest.raises(ValueError):
+        TokenBucket(refill_per_sec, capacity)
+
+
+def test_async_retry_credits_bucket_on_success(fake_clock: FakeClock) -> None:
+    """Test that the async wrapper takes a token per retry and credits successes."""
+    bucket = TokenBucket(refill_per_sec=0.0, capacity=5, clock=fake_clock.time)
+    calls = itertools.count(1)
+
+    @retry_with_backoff(
+        max_retries=2, initial_delay=0.01, sleep=fake_clock.sleep, clock=fake_clock.time, retry_bucket=bucket
+    )
+    async def flaky() -> str:
+        if next(calls) < 2:
+            raise CursorNetworkError("boom", cause=OSError("reset"))
+        return "ok"
+
+    assert asyncio.run(flaky()) == "ok"
+    assert bucket.tokens == pytest.approx(4.1)
+
+
+def test_async_retry_fails_fast_when_bucket_empty(fake_clock: FakeClock) -> None:
+    """Test that the async wrapper raises without backing off once the bucket is empty."""
+    bucket = TokenBucket(refill_per_sec=0.0, capacity=0.5, clock=fake_clock.time)
+
+    @retry_with_backoff(max_retries=3, sleep=fake_clock.sleep, clock=fake_clock.time, retry_bucket=bucket)
+    async def always_fails() -> None:
+        raise CursorNetworkError("boom", cause=OSError("reset"))
+
+    with pytest.raises(CursorNetworkError):
+        asyncio.run(always_fails())
+    assert fake_clock.sleeps == []
+
+
+def test_async_retry_with_async_client() -> None:
+    """Test that coroutine functions are retried with an async wrapper."""
+    calls = itertools.count(1)
 
     def handler(request: httpx.Request) -> httpx.Response:
-        call_count["value"] += 1
-        if call_count["value"] < 2:
-            # Rate limit without Retry-After header
-            return httpx.Response(429, json={"message": "Rate limited"})
+        n = next(calls)
+        if n < 3:
+            raise httpx.ConnectError("Connection failed", request=request)
         return httpx.Response(200, json={"ok": True})
 
-    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    async def run() -> object:
+        transport = httpx.MockTransport(handler)
+        async with AsyncCursorClient("test_key", base_url="https://example.test", transport=transport) as client:
 
-    @retry_with_backoff(max_retries=3, initial_delay=0.01)
-    def make_request() -> dict:
-        return client.get_v0_me()
+            @retry_with_backoff(max_retries=3, initial_delay=0.0)
+            async def make_request() -> object:
+                return await client.get_v0_me()
 
-    result = make_request()
-    assert result == {"ok": True}
-    assert call_count["value"] == 2
+            assert inspect.iscoroutinefunction(make_request)
+            return await make_request()
+
+    assert asyncio.run(run()) == {"ok": True}
+    assert next(calls) - 1 == 3
+
+
+def test_async_retry_does_not_block_event_loop() -> None:
+    """Test that concurrent async retries back off together instead of one at a time."""
+    async def run() -> tuple[list, list[float]]:
+        sleeps: list[float] = []
+        first_round = asyncio.Event()
 
-    client.close()
+        async def sleep(delay: float) -> None:
+            sleeps.append(delay)
+            if len(sleeps) == 10:
+                first_round.set()
+            # Every caller's first backoff must be pending at once; a blocking sleep would time out here
+            await asyncio.wait_for(first_round.wait(), 5.0)
 
+        @retry_with_backoff(max_retries=3, initial_delay=1.0, jitter=0.0, sleep=sleep)
+        async def flaky(attempts: list[None]) -> str:
+            attempts.append(None)
+            if len(attempts) <= 3:
+                raise CursorNetworkError("boom", cause=OSError("reset"))
+            return "ok"
+
+        results = await asyncio.gather(*(flaky([]) for _ in range(10)))
+        return results, sleeps
+
+    results, sleeps = asyncio.run(run())
+    assert results == ["ok"] * 10
+    assert sorted(sleeps) == [1.0] * 10 + [2.0] * 10 + [4.0] * 10
+
+
+def test_async_retry_exhausts_with_injected_sleep(fake_clock: FakeClock) -> None:
+    """Test that a plain (non-awaitable) sleep function also works for coroutine functions."""
+    events: list[RetryEvent] = []
+
+    @retry_with_backoff(
+        max_retries=2, initial_delay=0.1, jitter=0.0, sleep=fake_clock.sleep, clock=fake_clock.time, on_retry=events.append
+    )
+    async def always_fails() -> None:
+        raise CursorNetworkError("boom", cause=OSError("reset"))
+
+    assert always_fails._schedule == (0.1, 0.2)  # type: ignore[attr-defined]
+    with pytest.raises(CursorNetworkError):
+        asyncio.run(always_fails())
+    assert fake_clock.sleeps == [0.1, 0.2]
+    assert [(event.attempt, event.delay, event.reason) for event in events] == [(1, 0.1, "network"), (2, 0.2, "network")]
+    assert all(isinstance(event.exception, CursorNetworkError) for event in events)
+
+
+def test_async_retry_does_not_retry_other_errors(fake_clock: FakeClock) -> None:
+    """Test that exceptions outside retry_on propagate from coroutines immediately."""
+    attempts: list[None] = []
+
+    @retry_with_backoff(max_retries=3, sleep=fake_clock.sleep, clock=fake_clock.time)
+    async def broken() -> None:
+        attempts.append(None)
+        raise ValueError("not transient")
+
+    with pytest.raises(ValueError):
+        asyncio.run(broken())
+    assert len(attempts) == 1
+    assert fake_clock.sleeps == []
+
+
+@pytest.mark.parametrize("cancelled", [True, False])
+def test_async_retry_cancel_event(cancelled: bool) -> None:
+    """Test that cancel_event is honored without blocking the event loop."""
+    cancel_event = threading.Event()
+    if cancelled:
+        cancel_event.set()
+    attempts: list[None] = []
+
+    @retry_with_backoff(max_retries=2, initial_delay=0.01, cancel_event=cancel_event)
+    async def flaky() -> str:
+        attempts.append(None)
+        if len(attempts) < 2:
+            raise CursorNetworkError("boom", cause=OSError("reset"))
+        return "ok"
+
+    if cancelled:
+        with pytest.raises(CursorNetworkError):
+            asyncio.run(flaky())
+        assert len(attempts) == 1
+    else:
+        assert asyncio.run(flaky()) == "ok"
+        assert len(attempts) == 2
+
+
+def test_async_retry_cancel_event_wait_holds_no_thread() -> None:
+    """Test that an async backoff on cancel_event runs on the loop and stops when its task is cancelled."""
+    cancel_event = threading.Event()
+
+    @retry_with_backoff(max_retries=2, initial_delay=5.0, jitter=0.0, cancel_event=cancel_event)
+    async def always_fails() -> None:
+        raise CursorNetworkError("boom", cause=OSError("reset"))
+
+    async def run() -> None:
+        threads_before = threading.active_count()
+        task = asyncio.create_task(always_fails())
+        await asyncio.sleep(0.1)
+        # Backing off must not park a worker thread that outlives the task
+        assert threading.active_count() == threads_before
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
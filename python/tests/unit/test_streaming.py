@@ -0,0 +1,114 @@
+"""Tests for streaming list endpoints."""
+
+import json
+import sys
+from typing import Iterator
+
+import httpx
+import pytest
+
+from cursor_sdk import CursorClient
+from cursor_sdk.errors import CursorAPIError, CursorNetworkError
+
+
+def _chunks(payload: bytes, size: int) -> Iterator[bytes]:
+    for start in range(0, len(payload), size):
+        yield payload[start:start + size]
+
+
+def test_stream_v0_agents_yields_items_across_chunks() -> None:
+    """Test that agents are yielded one by one from a body split into small chunks."""
+    agents = [{"id": f"bc_{i}", "name": "x" * 50} for i in range(100)]
+    payload = json.dumps({"agents": agents, "nextCursor": "abc"}).encode()
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, content=_chunks(payload, 64), headers={"content-type": "application/json"})
+
+    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+
+    items = client.stream_v0_agents(params={"limit": 100})
+    assert seen == []  # Nothing is sent until iteration starts
+    assert next(items) == agents[0]
+    assert list(items) == agents[1:]
+    assert seen[0].url.path == "/v0/agents"
+    assert seen[0].url.params["limit"] == "100"
+    assert seen[0].headers["authorization"].startswith("Basic ")
+
+    client.close()
+
+
+def test_stream_v0_repositories() -> None:
+    """Test streaming the repositories list."""
+    repositories = [{"owner": "org", "name": "repo", "repository": "https://github.com/org/repo"}]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/v0/repositories"
+        return httpx.Response(200, json={"repositories": repositories})
+
+    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    assert list(client.stream_v0_repositories()) == repositories
+    client.close()
+
+
+def test_stream_error_response_raises_api_error() -> None:
+    """Test that a non-2xx response is raised before any items are yielded."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(429, json={"message": "Slow down"})
+
+    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    with pytest.raises(CursorAPIError) as exc_info:
+        list(client.stream_v0_agents())
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.message == "Slow down"
+    client.close()
+
+
+@pytest.mark.parametrize("content", [b'{"agents": [{"id": "bc_1"}, oops]}', b'{"agents": [{"id": "bc_1"},'], ids=["malformed", "truncated"])
+def test_stream_invalid_json_raises_api_error(content: bytes) -> None:
+    """Test that ijson parse errors surface as CursorAPIError rather than ijson exceptions."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=_chunks(content, 8))
+
+    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    items = client.stream_v0_agents()
+    with pytest.raises(CursorAPIError) as exc_info:
+        list(items)
+    assert exc_info.value.status_code == 200
+    assert "not valid JSON" in exc_info.value.message
+    assert exc_info.value.url == "/v0/agents"
+    client.close()
+
+
+@pytest.mark.parametrize("status_code", [204, 304])
+def test_stream_empty_response_yields_nothing(status_code: int) -> None:
+    """Test that 204 and 304 responses, which have no body, yield no items instead of failing to parse."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(status_code)
+
+    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    assert list(client.stream_v0_agents(headers={"If-None-Match": '"v1"'})) == []
+    client.close()
+
+
+def test_stream_network_error_raises_network_error() -> None:
+    """Test that transport failures are wrapped like regular requests."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("Connection failed", request=request)
+
+    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(handler))
+    with pytest.raises(CursorNetworkError) as exc_info:
+        list(client.stream_v0_agents())
+    assert exc_info.value.url == "/v0/agents"
+    client.close()
+
+
+def test_stream_without_ijson_raises_import_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a missing optional dependency gives an actionable error."""
+    monkeypatch.setitem(sys.modules, "ijson", None)
+
+    client = CursorClient("test_key", base_url="https://example.test", transport=httpx.MockTransport(lambda r: httpx.Response(200)))
+    with pytest.raises(ImportError, match=r"cursor-endpoint-sdk\[stream\]"):
+        next(client.stream_v0_agents())
+    client.close()